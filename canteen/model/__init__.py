@@ -55,7 +55,8 @@ _PROPERTY_SLOTS = (
   '_required',  # should property should be required?
   '_repeated',  # should property be allowed to keep multiple values?
   '_basetype',  # property base type, for validation and storage
-  '_default')  # default value for property, defaults to ``None``
+  '_default',  # default value for property, defaults to ``None``
+  '_has_default')  # was a default value explicitly specified?
 
 
 def is_there_a_global(name):
@@ -951,7 +952,7 @@ class AbstractModel(object):
 
       # skip unset properties without a default, except in `explicit` mode
       if (value == Property._sentinel and (not self.__explicit__)):
-        if self.__class__.__dict__[name]._default != Property._sentinel:
+        if self.__class__.__dict__[name]._has_default:
           # return a prop's default in `implicit` mode
           yield name, self.__class__.__dict__[name].default
         continue  # pragma: no cover
@@ -1307,7 +1308,8 @@ class Property(object):
     # specified in `self.__slots__`
     map(lambda args: setattr(self, *args), (
           zip(self.__slots__, (
-            name, options, indexed, required, repeated, basetype, default))))
+            name, options, indexed, required, repeated, basetype, default,
+            default is not self._sentinel))))
 
   ## = Descriptor Methods = ##
   def __get__(self, instance, owner):
@@ -1343,7 +1345,7 @@ class Property(object):
       # grab value, returning special
       # a) property default or
       # b) sentinel if we're in explicit mode and it is unset
-      if self.default != Property.sentinel:  # we have a set default
+      if self._has_default:  # we have a set default
         value = instance._get_value(self.name, default=self.default)
       else:
         value = instance._get_value(self.name, default=Property.sentinel)
@@ -1448,12 +1450,13 @@ class Property(object):
                                       self._indexed, **self._options)
 
   # config accessors
-  basetype, required, repeated, indexed, options = (
+  basetype, required, repeated, indexed, options, has_default = (
     property(lambda self: self._basetype),
     property(lambda self: self._required),
     property(lambda self: self._repeated),
     property(lambda self: self._indexed),
-    property(lambda self: self._options))
+    property(lambda self: self._options),
+    property(lambda self: self._has_default))
 
   @property
   def default(self):
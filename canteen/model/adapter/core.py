@@ -79,12 +79,18 @@ class AdaptedKey(KeyMixin):
   def urlsafe(self, joined=None):
 
     """ Generate an encoded version of this Key, suitable for use in URLs.
+        Persisted keys can no longer change, so their encoding is cached.
 
         :param joined:
         :returns: """
 
-    if not joined: joined, flat = self.flatten(True)
-    return base64.b64encode(joined)
+    if joined: return base64.b64encode(joined)
+
+    encoded = getattr(self, '__urlsafe__', None)
+    if encoded is None:
+      encoded = base64.b64encode(self.flatten(True)[0])
+      if self.__persisted__: self.__urlsafe__ = encoded
+    return encoded
 
   ## = Class Methods = ##
   @classmethod
@@ -326,7 +332,23 @@ class DictMixin(ModelMixin):
               convert_keys=True, convert_models=True, convert_datetime=True):
 
     """ Export this Entity as a dictionary, excluding/including/ filtering/
-        mapping as we go.
+        mapping as we go. See :py:meth:`to_dict_iter` for arguments.
+
+        :returns: ``dict`` of exported property names and values. """
+
+    return dict(self.to_dict_iter(*(
+      exclude, include, filter, map, _all, filter_fn, map_fn,
+      convert_keys, convert_models, convert_datetime)))
+
+  def to_dict_iter(self, exclude=tuple(), include=tuple(),
+                   filter=None, map=None, _all=False,
+                   filter_fn=filter, map_fn=map,
+                   convert_keys=True, convert_models=True,
+                   convert_datetime=True):
+
+    """ Export this Entity as a stream of ``(name, value)`` pairs, excluding/
+        including/filtering/mapping as we go. Backs :py:meth:`to_dict`, and
+        may be used directly to avoid allocating an intermediate ``dict``.
 
         :param exclude:
         :param include:
@@ -339,11 +361,10 @@ class DictMixin(ModelMixin):
         :param convert_models:
 
         :raises:
-        :returns: """
+        :yields: ``(name, value)`` pairs for each exported property. """
 
     from canteen import model
 
-    dictionary = {}  # return dictionary
     _default_include = False  # flag for including properties unset
 
     # explicit mode implies returning all properties raw
@@ -391,7 +412,7 @@ class DictMixin(ModelMixin):
           continue  # skip if all properties not requested
         else:
           if not self.__explicit__:  # None == sentinel in implicit mode
-            dictionary[name] = None
+            yield name, None
             continue
 
       _bundle = []
@@ -437,11 +458,9 @@ class DictMixin(ModelMixin):
           _bundle.append(_val)
 
       if _property_descriptor.repeated:
-        dictionary[name] = (
-          tuple(_bundle) if isinstance(value, tuple) else _bundle)
+        yield name, (tuple(_bundle) if isinstance(value, tuple) else _bundle)
       else:
-        dictionary[name] = _bundle.pop()
-    return dictionary
+        yield name, _bundle.pop()
 
   @classmethod
   def to_dict_schema(cls):
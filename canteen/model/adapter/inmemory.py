@@ -14,12 +14,12 @@
 """
 
 # stdlib
-import time
-import json
-import base64
+import array
+import bisect
 import datetime
 import itertools
 import collections
+from operator import attrgetter
 
 # adapter API
 from .abstract import DirectedGraphAdapter
@@ -29,17 +29,443 @@ from .abstract import DirectedGraphAdapter
 _init, _graph, _metadata, _datastore = (
   False, {}, {}, {})
 
+_ops = array.array('L', (0, 0, 0))  # op counters, indexed by `_OP_*`
+_interned = {}  # maps flattened keys to their canonical instance
+_paths = {}  # maps index paths, `(kind, property)`, to their canonical instance
+_empty = frozenset()  # shared stand-in for missing reverse indexes
+
 
 ## Constants
+_OP_GET, _OP_PUT, _OP_DELETE = 0, 1, 2  # offsets into `_ops`
+
 _sorted_types = (int,
                  long,
                  float,
                  datetime.date,
                  datetime.datetime)
 
+_sorted_dispatch = dict.fromkeys(_sorted_types + (bool,), True)
+_string_types = frozenset((str, unicode))
+_mapping_types = frozenset((dict,
+                            collections.OrderedDict,
+                            collections.defaultdict))
+
 
 ## Utils
-_to_timestamp = lambda dt: int(time.mktime(dt.timetuple()))
+_intern = lambda flattened: _interned.setdefault(flattened, flattened)
+_intern_path = lambda path: _paths.setdefault(path, path)
+
+
+def _to_timestamp(dt, _epoch=datetime.datetime(1970, 1, 1),
+                        _epoch_ordinal=datetime.date(1970, 1, 1).toordinal()):
+
+  """ Convert a ``date`` or ``datetime`` to an orderable integer, for storage
+      in (and comparison against) sorted indexes. Both types land on the same
+      scale (seconds since the epoch), with plain dates taken at midnight, so
+      mixed ``date`` and ``datetime`` values compare correctly.
+
+      :param dt: ``date`` or ``datetime`` to convert.
+
+      :returns: Integer suitable for range comparisons. """
+
+  if isinstance(dt, datetime.datetime):
+    if dt.tzinfo is not None:  # pragma: no cover
+      dt = dt.replace(tzinfo=None) - dt.utcoffset()
+    return int((dt - _epoch).total_seconds())
+  return (dt.toordinal() - _epoch_ordinal) * 86400
+
+
+def _is_sorted(value):
+
+  """ Check whether ``value`` belongs in a sorted index. Results are memoized
+      per concrete type in ``_sorted_dispatch``, sparing the ``isinstance``
+      walk over ``_sorted_types`` for every value.
+
+      :param value: Value to check.
+
+      :returns: ``True`` if ``value`` is of a sortable type. """
+
+  try:
+    return _sorted_dispatch[type(value)]
+  except KeyError:
+    return _sorted_dispatch.setdefault(*(
+      type(value), isinstance(value, _sorted_types)))
+
+
+class _KindMeta(object):
+
+  """ Compact record holding per-kind metadata. Kept in ``_metadata['kinds']``
+      in place of a small ``dict``, which is much heavier per-instance. """
+
+  __slots__ = ('id_pointer', 'entity_count', 'keys')
+
+  def __init__(self):
+
+    """ Initialize an empty ``_KindMeta`` record. """
+
+    self.id_pointer, self.entity_count, self.keys = 0, 0, set()
+
+
+class _SetPool(object):
+
+  """ Bounded free-list of empty ``set`` objects. Index entries are provisioned
+      from the pool and handed back when trimmed, so churning entities
+      recycle containers instead of hitting the allocator each time. """
+
+  __slots__ = ('free', 'limit')
+
+  def __init__(self, limit=4096):
+
+    """ Initialize an empty ``_SetPool``.
+
+        :param limit: Maximum number of idle sets to hold onto. """
+
+    self.free, self.limit = [], limit
+
+  def acquire(self):
+
+    """ Acquire an empty ``set``, recycling an idle one if available.
+
+        :returns: Empty ``set`` instance. """
+
+    return self.free.pop() if self.free else set()
+
+  def release(self, target):
+
+    """ Return a ``set`` to the pool, if there is room for it.
+
+        :param target: ``set`` that is no longer referenced by any index. """
+
+    if len(self.free) < self.limit:
+      target.clear()
+      self.free.append(target)
+
+
+_sets = _SetPool()  # shared pool for index entry sets
+
+
+class _QueryCache(object):
+
+  """ Bounded LRU cache of query results, keyed by query signature. Results
+      are flushed wholesale (moving on to a new generation) whenever a write
+      has finished updating the datastore and its indexes. """
+
+  __slots__ = ('results', 'generation', 'limit')
+
+  def __init__(self, limit=128):
+
+    """ Initialize an empty ``_QueryCache``.
+
+        :param limit: Maximum number of query results to hold onto. """
+
+    self.results, self.generation, self.limit = (
+      collections.OrderedDict(), 0, limit)
+
+  def invalidate(self):
+
+    """ Flush all cached results and move on to a new generation, so results
+        computed against the old datastore are never cached. """
+
+    self.generation += 1
+    self.results.clear()
+
+  def get(self, signature):
+
+    """ Retrieve cached results for a query, if any.
+
+        :param signature: Hashable query signature, from ``_query_signature``.
+
+        :returns: ``tuple`` of cached results, or ``None`` on a miss. """
+
+    try:
+      results = self.results.pop(signature)
+    except KeyError:
+      return None
+    self.results[signature] = results  # mark as most-recently used
+    return results
+
+  def set(self, signature, results, generation):
+
+    """ Cache results for a query, evicting the least-recently used entry if
+        the cache is full. Results are dropped if the datastore has changed
+        since they were computed.
+
+        :param signature: Hashable query signature, from ``_query_signature``.
+        :param results: ``tuple`` of query results.
+        :param generation: Cache generation the query started in. """
+
+    if generation != self.generation:
+      return  # a write landed mid-query, results may be stale
+    self.results[signature] = results
+    if len(self.results) > self.limit:
+      self.results.popitem(last=False)
+
+
+_queries = _QueryCache()  # shared cache of query results
+
+
+def _query_signature(kind, spec, options):
+
+  """ Build a hashable signature for a query, to key cached results against.
+
+      :param kind: :py:class:`model.Model` subtype being queried.
+      :param spec: Tuple of ``(filters, sorts)`` for the query.
+      :param options: :py:class:`canteen.model.query.QueryOptions` instance.
+
+      :returns: ``tuple`` signature, or ``None`` if the query cannot be cached
+        (i.e. it filters on an unhashable value). """
+
+  from canteen import model
+
+  def _filter_signature(_f):
+
+    """ Describe a filter fully: its target, operator and value, plus the
+        direction of edge filters and any chained subfilters. """
+
+    return (_f.kind, getattr(_f.target, 'name', None), _f.operator, (
+      _f.value.data if isinstance(_f.value, model.Model._PropertyValue) else (
+        _f.value)), getattr(_f, 'tails', None), _f.sub_operator, tuple((
+          _filter_signature(_sub) for _sub in (_f.chain or ()))))
+
+  filters, sorts = spec
+
+  ancestor = options.ancestor
+  if isinstance(ancestor, model.Model):
+    ancestor = ancestor.key
+  if isinstance(ancestor, model.Key):
+    ancestor = ancestor.flatten(True)[1]
+
+  signature = (
+    kind.__name__ if kind else None,
+    tuple(_filter_signature(_f) for _f in filters),
+    tuple((_s.target.name, _s.operator) for _s in sorts),
+    ancestor, options.limit, options.offset)
+
+  try:
+    hash(signature)
+  except TypeError:
+    return None
+  return signature
+
+
+## Index Writers
+def _write_invalid_index(cls, *args):  # pragma: no cover
+
+  """ Reject an empty index write.
+
+      :raises RuntimeError: Always, as empty index writes are invalid. """
+
+  raise RuntimeError("Index mapping tuples must have at least 2 entries,"
+                     " for a simple set index, or more for"
+                     " a hashed index.")
+
+
+def _write_key_index(cls, _write, target, write):
+
+  """ Write a simple key mapping, in the form ``(index,)``.
+
+      :param cls: Adapter class the write is being performed for.
+      :param _write: Index mapping to commit the write to.
+      :param target: Key being indexed.
+      :param write: Index write ``tuple``.
+
+      :returns: Reverse index entry for ``target``, if any. """
+
+  # extract singular index
+  index = write[0]
+
+  # special case: key index
+  if index == cls._key_prefix:
+    _write.setdefault(index, set()).add(target)
+    return None
+
+  # add value to index, provisioning it as needed
+  index_map = _write.setdefault(index, {})
+  if target not in index_map:
+    index_map[target] = _sets.acquire()  # one-index entry
+
+  return index,  # reverse index entry
+
+
+def _write_set_index(cls, _write, target, write):
+
+  """ Write a simple set index, in the form ``(index, value)``.
+
+      :param cls: Adapter class the write is being performed for.
+      :param _write: Index mapping to commit the write to.
+      :param target: Key being indexed.
+      :param write: Index write ``tuple``.
+
+      :returns: Reverse index entry for ``target``, if any. """
+
+  # extract write, inflate
+  index, value = write
+
+  # resolve value set, provisioning it on first sight
+  try:
+    bucket = _write[index][value]
+  except KeyError:
+    bucket = _write.setdefault(index, {})[value] = _sets.acquire()
+
+  # only provision if value and index are different
+  if index != value:
+
+    # add flattened key
+    bucket.add(target)
+
+  return index  # reverse index entry
+
+
+def _write_map_index(cls, _write, target, write):  # pragma: no cover
+
+  """ Write a simple map index, in the form ``(index, dimension, value)``.
+
+      :param cls: Adapter class the write is being performed for.
+      :param _write: Index mapping to commit the write to.
+      :param target: Key being indexed.
+      :param write: Index write ``tuple``.
+
+      :returns: Reverse index entry for ``target``, if any. """
+
+  # @TODO(sgammon): Do we need this?
+
+  # extract write, inflate
+  index, dimension, value = write
+
+  # map the value, provisioning the index hash as needed
+  _write.setdefault(index, {}).setdefault(dimension, set()).add(value)
+
+  # add sorted mark, if necessary
+  if isinstance(value, tuple) and _is_sorted(value[0]):
+    _write[index].setdefault((dimension, '__sorted__'), {})[target] = value
+
+  return index, dimension  # reverse index entry
+
+
+def _write_hashed_index(cls, _write, target, write):
+
+  """ Write a hashed/mapped index, in the form ``(index, path..., value)``.
+
+      :param cls: Adapter class the write is being performed for.
+      :param _write: Index mapping to commit the write to.
+      :param target: Key being indexed.
+      :param write: Index write ``tuple``.
+
+      :returns: Reverse index entry for ``target``, if any. """
+
+  # extract write, inflate
+  index, path, value = write[0], _intern_path(write[1:-1]), write[-1]
+
+  if type(value) in _mapping_types:  # pragma: no cover
+    return None  # cannot index dictionaries
+
+  # convert dates/timestamps so they sort alongside other scalar values
+  if isinstance(value, datetime.date):
+    value = _to_timestamp(value)
+
+  # write key to index column, mapping `value -> keys` for this path
+  try:
+    _write[index][path][value].add(target)
+  except KeyError:
+    # provision the index hash (custom indexes), column and/or value set
+    column = _write.setdefault(index, {}).setdefault(path, {})
+    column[value] = _sets.acquire()
+    column[value].add(target)
+
+    # keep distinct sortable values in order, so ranges can be bisected
+    if _is_sorted(value):
+      bisect.insort(
+        _write.setdefault('sorted', {}).setdefault((index, path), []), value)
+
+  return index, path, value  # reverse index entry
+
+
+# index writers, by length of index write (hashed writes are 4+ entries long)
+_index_writers = (_write_invalid_index,
+                  _write_key_index,
+                  _write_set_index,
+                  _write_map_index,
+                  _write_hashed_index)
+
+
+## Index Cleaners
+def _clean_index_entry(cls, target, entry):
+
+  """ Clean a single index entry for a key that is due to be deleted.
+
+      :param cls: Adapter class the cleanup is being performed for.
+      :param target: Key being cleaned from the index.
+      :param entry: Index entry ``tuple``, from the reverse index or meta
+        indexes for ``target``. """
+
+  if len(entry) == 3:  # hashed index
+
+    # extract write, bind index mapping once
+    index, path, value = entry
+    index_map = _metadata.get(index, {})
+
+    if isinstance(path, tuple):
+      column = index_map.get(path, {})
+      bucket = column.get(value)
+      if bucket is not None:
+        bucket.discard(target)
+
+        # if there's no keys left for the value, trim it
+        if not bucket:
+          _sets.release(column.pop(value))
+
+          # drop it from the column's ordered values, if it was sortable
+          values = _metadata['sorted'].get((index, path))
+          if values:
+            at = bisect.bisect_left(values, value)
+            if at < len(values) and values[at] == value:
+              del values[at]
+
+          # if there's no values left in the column, trim that too
+          if len(column) == 0:
+            del index_map[path]
+            _metadata['sorted'].pop((index, path), None)
+
+    # (mostly covers custom indexes)
+    elif isinstance(path, basestring):  # pragma: no cover
+      bucket = index_map.get(path)
+      if bucket is not None:
+        bucket.discard(target)
+
+        # if there's no keys left in the entry, trim it
+        if not bucket:
+          del index_map[path]
+
+  elif len(entry) == 2:  # simple set index
+
+    # extract write, bind index mapping once
+    index, value = entry
+    index_map = _metadata.get(index, {})
+
+    bucket = index_map.get(value)
+    if bucket is not None:
+
+      # check sorted-ness
+      sorted_map = index_map.get((value, '__sorted__'))
+      if sorted_map is not None:
+        sorted_entry = sorted_map.get(target)
+        if sorted_entry:
+          bucket.discard(sorted_entry)
+
+      else:
+        # remove from set at item in mapping
+        bucket.discard(target)
+
+      # if there's no keys left in the index, trim it
+      if not bucket:  # pragma: no cover
+        _sets.release(index_map.pop(value))
+
+  elif len(entry) == 1:  # simple key mapping
+
+    # skip keys, that's done by `delete()`
+    index_map = _metadata[entry[0]]
+    if entry[0] != cls._key_prefix and target in index_map:
+      _sets.release(index_map.pop(target))
 
 
 class InMemoryAdapter(DirectedGraphAdapter):
@@ -48,13 +474,6 @@ class InMemoryAdapter(DirectedGraphAdapter):
       reference ``DirectedGraphAdapter`` implementation. Supports querying
       and graph storage. """
 
-  # key encoding
-  _key_encoder = base64.b64encode
-
-  # data compression / encoding
-  _data_encoder = json.dumps
-  _data_compressor = None
-
   is_supported = classmethod(lambda cls: True)  # always supported
 
   @classmethod
@@ -75,13 +494,11 @@ class InMemoryAdapter(DirectedGraphAdapter):
     if not _init:
       _init, _metadata, _graph = True, {
 
-        'ops': {  # holds count of performed operations
-          'get': 0,  # track # of entity get() operations
-          'put': 0,  # track # of entity put() operations
-          'delete': 0},  # track # of entity delete() operations
+        'ops': _ops,  # count of get/put/delete ops, indexed by `_OP_*`
 
         'keys': set(),  # holds set of all known keys
-        'kinds': {},  # holds current count and ID increment
+        'sorted': {},  # holds ordered distinct values for sortable columns
+        'kinds': collections.defaultdict(_KindMeta),  # count and ID increment
         'global': {  # holds global metadata, like entity count
           'entity_count': 0,  # holds global count of all entities
           'node_count': 0,  # holds count of known nodes
@@ -123,6 +540,22 @@ class InMemoryAdapter(DirectedGraphAdapter):
     # pass up the chain to create a singleton
     return super(InMemoryAdapter, cls).acquire(name, bases, properties)
 
+  def _delete(self, key, **kwargs):
+
+    """ Low-level method for deleting an entity by Key. Fuses index cleanup
+        and deletion via :py:meth:`delete_with_indexes`.
+
+        :param key: Target :py:class:`model.Key` to delete.
+        :returns: Result of the delete operation. """
+
+    if self.config.get('debug', False):  # pragma: no cover
+      self.logging.info("Deleting Key: \"%s\"." % key)
+
+    joined, flat = key.flatten(True)
+    return self.delete_with_indexes((
+      self.encode_key(joined, flat) or key.urlsafe(joined), flat),
+        self.generate_indexes(key), **kwargs)
+
   @classmethod
   def get(cls, key, **kwargs):
 
@@ -137,16 +570,16 @@ class InMemoryAdapter(DirectedGraphAdapter):
         :returns: Entity at ``key``, if any, or ``None`` if no entity could
           be found at ``key``. """
 
-    global _metadata
-
     # key format: tuple(<str encoded key>, <tuple flattened key>)
     encoded, flattened = key
 
     # pull from in-memory backend
-    entity = _datastore.get(flattened)
-    if entity is None: return  # not found
+    try:
+      entity = _datastore[flattened]
+    except KeyError:
+      return  # not found
 
-    _metadata['ops']['get'] += 1
+    _ops[_OP_GET] += 1
     return entity  # construct + inflate entity
 
   @classmethod
@@ -168,14 +601,26 @@ class InMemoryAdapter(DirectedGraphAdapter):
 
     from canteen import model
 
-    for key in keys:
-      encoded, flattened = key = key if not isinstance(key, model.Key) else (
-        key.flatten(True))
-      obj = cls.get(key)
+    _hits = 0
+    try:
+      for key in keys:
+        encoded, flattened = key if not isinstance(key, model.Key) else (
+          key.flatten(True))
+
+        # pull directly, op counts are bumped in bulk
+        try:
+          obj = _datastore[flattened]
+        except KeyError:
+          yield None  # not found
+          continue
+
+        # inflate key + model and return
+        _hits += 1
+        obj.key.__persisted__ = True
+        yield obj
 
-      # inflate key + model and return
-      obj.key.__persisted__ = True
-      yield obj
+    finally:
+      _ops[_OP_GET] += _hits
 
   @classmethod
   def put(cls, key, entity, model, **kwargs):
@@ -197,50 +642,34 @@ class InMemoryAdapter(DirectedGraphAdapter):
           including any elements of ``key`` which required population from
            things like ID provisioning. """
 
-    global _graph, _metadata, _datastore
-
     # encode key and flatten
     encoded, flattened = key
-    target = flattened
-
-    # perform validation
-    with entity:
+    target = _intern(flattened)  # share one key instance across indexes
 
-      if entity.key.kind not in _metadata['kinds']:  # pragma: no cover
-        _metadata['kinds'][entity.key.kind] = {
-          'id_pointer': 0,  # keep current key ID pointer
-          'entity_count': 0,  # keep count of seen entities for each kind
-          'keys': set()}  # keep set of all keys for kind
+    # resolve kind metadata (provisioned on first sight) and global counts
+    kind_blob, counts = _metadata['kinds'][flattened[1]], _metadata['global']
 
-      # update counts
-      _metadata['ops']['put'] = _metadata['ops'].get('put', 0) + 1
+    # update counts
+    _ops[_OP_PUT] += 1
+    kind_blob.entity_count += 1
+    counts['entity_count'] += 1
 
-      _metadata['global']['entity_count'] = (
-        _metadata['global'].get('entity_count', 0) + 1)
+    # add to keys for kind
+    kind_blob.keys.add(target)
 
-      kinded_entity_count = (
-        _metadata['kinds'][entity.key.kind].get('entity_count', 0))
+    # add to main keys index
+    _metadata['keys'].add(target)
 
-      _metadata['kinds'][entity.key.kind]['entity_count'] = (
-        kinded_entity_count + 1)
+    # save to datastore (by reference, entities are never serialized)
+    _datastore[target] = entity
 
-      # add to keys for kind
-      kinded_keys = _metadata['kinds'][entity.key.kind].get('keys', set())
-      kinded_keys.add(target)
-      _metadata['kinds'][entity.key.kind]['keys'] = kinded_keys
+    # store vertexes separately
+    if getattr(model, '__vertex__', False):
+      _graph['nodes'][entity.key.kind].add(target)
 
-      # add to main keys index
-      _metadata['keys'].add(target)
-
-      # save to datastore
-      _datastore[target] = entity
-
-      # store vertexes separately
-      if getattr(model, '__vertex__', False):
-        _graph['nodes'][entity.key.kind].add(target)
-
-      # store edges separately
-      elif getattr(model, '__edge__', False):
+    # store edges separately (reading edge properties in explicit mode)
+    elif getattr(model, '__edge__', False):
+      with entity:
 
         # directed edges
         if model.__spec__.directed:
@@ -262,12 +691,15 @@ class InMemoryAdapter(DirectedGraphAdapter):
 
         # undirected edges
         else:
+          neighbors, edges = (
+            _graph['neighbors']['undirected'], _graph['edges']['undirected'])
+
           for origin in entity['peers']:
             for target in entity['peers']:
               if origin == target: continue
-              _graph['neighbors']['undirected'][origin].add(target)
-              _graph['edges']['undirected'][origin].add(entity.key)
-              _graph['edges']['undirected'][target].add(entity.key)
+              neighbors[origin].add(target)
+              edges[origin].add(entity.key)
+              edges[target].add(entity.key)
 
     return entity.key
 
@@ -285,8 +717,6 @@ class InMemoryAdapter(DirectedGraphAdapter):
         :returns: ``True`` if the entity at ``key`` was found and deleted,
           ``False`` if the entity could not be found for deletion. """
 
-    global _metadata, _datastore
-
     # extract key
     if not isinstance(key, tuple):  # pragma: no cover
       encoded, flattened = key.flatten(True)
@@ -296,29 +726,23 @@ class InMemoryAdapter(DirectedGraphAdapter):
     # extract key parts
     parent, kind, _id = flattened
 
-    # if we have the key...
-    if flattened in _metadata[cls._key_prefix]:
-      try:
-        del _datastore[flattened]  # delete from datastore
-
-      except KeyError:  # pragma: no cover
-        _metadata[cls._key_prefix].remove(flattened)
-        return False  # untrimmed key
-
-      else:
-        # update meta
-        _metadata[cls._key_prefix].remove(flattened)
-        _metadata['ops']['delete'] = (
-          _metadata['ops'].get('delete', 0) + 1)
-
-        _metadata['global']['entity_count'] = (
-          _metadata['global'].get('entity_count', 1) - 1)
+    # if we have the key, trim it (test and removal in one go)
+    try:
+      _metadata[cls._key_prefix].remove(flattened)
+    except KeyError:
+      return False  # not found
 
-        _metadata['kinds'][kind]['entity_count'] = (
-          _metadata['kinds'][kind].get('entity_count', 1) - 1)
+    # delete from datastore
+    if _datastore.pop(flattened, None) is None:  # pragma: no cover
+      return False  # untrimmed key
 
-      return True
-    return False
+    # update meta
+    _interned.pop(flattened, None)
+    _ops[_OP_DELETE] += 1
+    _metadata['kinds'][kind].entity_count -= 1
+    _metadata['global']['entity_count'] -= 1
+    _queries.invalidate()  # indexes are cleaned before `delete` is called
+    return True
 
   @classmethod
   def allocate_ids(cls, key_class, kind, count=1, **kwargs):
@@ -338,32 +762,20 @@ class InMemoryAdapter(DirectedGraphAdapter):
         :param kwargs: Implementation-specific flags/kwargs to the underlying
           adapter from the application.
 
-        :raises StopIteration: When all the requested IDs have been allocated
-          and yielded to the application.
-
-        :returns: If a ``count`` is given that is ``> 1``, will return a
-          generator function that will ``yield`` IDs up to ``count`` one at a
-          time. Otherwise, returns the newly-provisioned ID integer directly,
-          making the return type either ``function`` (if ``count`` is greater
-          than one) or ``int``/``long``. """
-
-    global _metadata
+        :returns: If a ``count`` is given that is ``> 1``, will return an
+          ``xrange`` over the ``count`` newly-provisioned IDs. Otherwise,
+          returns the newly-provisioned ID integer directly, making the
+          return type either ``xrange`` (if ``count`` is greater than one)
+          or ``int``/``long``. """
 
     # resolve kind meta and increment pointer
-    kind_blob = _metadata['kinds'].get(kind, {})
-    current = kind_blob.get('id_pointer', 0)
-    pointer = kind_blob['id_pointer'] = (current + count)
-
-    # update kind blob
-    _metadata['kinds'][kind] = kind_blob
+    kind_blob = _metadata['kinds'][kind]
+    current = kind_blob.id_pointer
+    pointer = kind_blob.id_pointer = (current + count)
 
-    # return IDs
+    # return IDs (`current` itself was handed out by the last allocation)
     if count > 1:
-      def _generate_id_range():
-        for x in xrange(current, pointer):
-          yield x
-        raise StopIteration()
-      return _generate_id_range
+      return xrange(current + 1, pointer + 1)
     return pointer
 
   @classmethod
@@ -384,140 +796,34 @@ class InMemoryAdapter(DirectedGraphAdapter):
         :returns: Writes committed to the ``_metadata`` ``dict``, for
           inspection. """
 
-    global _metadata
-
     _write = {} if not execute else _metadata
 
     # extract indexes
     target, meta, properties = writes
+    target = _intern(target)  # identity-compare in index sets and frames
 
-    # write indexes one-by-one, generating reverse entries as we go
+    # write indexes one-by-one, dispatching on the shape of each write
+    _reverse_entries = []
     for serializer, write in itertools.chain(
       ((None, _m) for _m in meta), (bundle for bundle in properties)):
 
       # filter out strings, convert to 1-tuples
-      if isinstance(write, basestring):  # pragma: no cover
+      if type(write) in _string_types:  # pragma: no cover
         write = (write,)
 
-      if len(write) > 3:  # hashed/mapped index
-
-        # extract write, inflate
-        index, path, value = write[0], write[1:-1], write[-1]
-
-        if isinstance(value, dict):  # pragma: no cover
-          continue  # cannot index dictionaries
-
-        # convert into a compound sorted index
-        if isinstance(value, _sorted_types):
-
-          if isinstance(value, datetime.datetime):
-            value = _to_timestamp(value)
-
-          write = (index, path, (value, target))
-
-        else:
-          # init index hash (mostly covers custom indexes)
-          if index not in _write:  # pragma: no cover
-            _write[index] = {(path, value): set()}
-
-          elif (path, value) not in _write[index]:
-            _write[index][(path, value)] = set()
-
-          # write key to index
-          _write[index][(path, value)].add(target)
-
-          # add reverse index
-          if target not in _write[cls._reverse_prefix]:  # pragma: no cover
-            _write[cls._reverse_prefix][target] = set()
-          _write[cls._reverse_prefix][target].add((index, path, value))
-
-          continue
-
-      if len(write) == 3:  # pragma: no cover
-        # @TODO(sgammon): Do we need this?
-
-        # simple map index
-
-        # extract write, inflate
-        index, dimension, value = write
-
-        # init index hash
-        if index not in _write:
-          _write[index] = {dimension: {value}}
-
-        elif dimension not in _write[index]:
-          _write[index][dimension] = {value}
-
-        else:
-          # everything is there, map the value
-          _write[index][dimension].add(value)
-
-        # add sorted mark, if necessary
-        if isinstance(value, tuple) and isinstance(value[0], _sorted_types):
-          _mark = (dimension, '__sorted__')
-          if _mark not in _write[index]:
-            _write[index][_mark] = {}
-          _write[index][_mark][target] = value
-
-        # add reverse index
-        if target not in _write[cls._reverse_prefix]:
-          _write[cls._reverse_prefix][target] = set()
-        _write[cls._reverse_prefix][target].add((index, dimension))
-        continue
-
-      elif len(write) == 2:  # simple set index
+      entry = _index_writers[min(len(write), 4)](cls, _write, target, write)
+      if entry is not None: _reverse_entries.append(entry)
 
-        # extract write, inflate
-        index, value = write
-
-        # init index hash
-        if index not in _write:  # pragma: no cover
-          _write[index] = {value: set()}
-
-        # init value set
-        elif value not in _write[index]:
-          _write[index][value] = set()
-
-        # only provision if value and index are different
-        if index != value:
-
-          # add flattened key
-          _write[index][value].add(target)
-
-        # add reverse index
-        if target not in _write[cls._reverse_prefix]:
-          _write[cls._reverse_prefix][target] = set()
-        _write[cls._reverse_prefix][target].add(index)
-        continue
-
-      elif len(write) == 1:  # simple key mapping
-
-        # extract singular index
-        index = write[0]
-
-        # special case: key index
-        if index == cls._key_prefix:
-          _write[index].add(target)
-          continue
-
-        # provision index
-        if index not in _write:  # pragma: no cover
-          _write[index] = {}
-
-        # add value to index
-        _write[index][target] = set()  # provision with a one-index entry
-
-        # add reverse index
-        if target not in _write[cls._reverse_prefix]:  # pragma: no cover
-          _write[cls._reverse_prefix][target] = set()
-        _write[cls._reverse_prefix][target].add((index,))
-        continue
-
-      else:  # pragma: no cover
-        raise RuntimeError("Index mapping tuples must have at least 2 entries,"
-                           " for a simple set index, or more for"
-                           " a hashed index.")
+    # add reverse index entries for this key in one go
+    reverse_map = _write.setdefault(cls._reverse_prefix, {})
+    try:
+      reverse = reverse_map[target]
+    except KeyError:
+      reverse = reverse_map[target] = _sets.acquire()
+    reverse.update(_reverse_entries)
 
+    if execute:  # entity and indexes are both written, flush cached queries
+      _queries.invalidate()
     return _write
 
   @classmethod
@@ -534,16 +840,15 @@ class InMemoryAdapter(DirectedGraphAdapter):
 
         :returns: ``set`` instance containing index keys that were cleaned. """
 
-    global _metadata
-
     target, meta, graph = writes  # extract indexes
+    reverse_map = _metadata[cls._reverse_prefix]
 
     # pull reverse indexes
-    reverse = _metadata[cls._reverse_prefix].get(target, set())
+    reverse = reverse_map.get(target, _empty)
 
-    _cleaned = set()  # clear reverse indexes
+    _cleaned = set()  # clear reverse indexes (`_cleaned` de-duplicates)
     if len(reverse) or len(meta):
-      for i in reverse | set(meta):
+      for i in itertools.chain(reverse, meta):
 
         # convert to tuple to be consistent
         if not isinstance(i, tuple):
@@ -555,66 +860,43 @@ class InMemoryAdapter(DirectedGraphAdapter):
         else:
           _cleaned.add(i)
 
-        if len(i) == 3:  # hashed index
-
-          # extract write, clean
-          index, path, value = i
-
-          if isinstance(path, tuple):
-            if index in _metadata and (path, value) in _metadata[index]:
-              _metadata[index][(path, value)].remove(target)
+        _clean_index_entry(cls, target, i)
 
-              # if there's no keys left in the index, trim it
-              if len(_metadata[index][(path, value)]) == 0:
-                del _metadata[index][(path, value)]
+    if target in reverse_map:
+      # last step: remove reverse index for key, recycling its set
+      _sets.release(reverse_map.pop(target))
 
-            continue
-
-          # (mostly covers custom indexes)
-          if isinstance(path, basestring):  # pragma: no cover
-            if index in _metadata and path in _metadata[index]:
-              _metadata[index][path].remove(target)
-
-              # if there's no keys left in the entry, trim it
-              if len(_metadata[index][path]) == 0:
-                del _metadata[index][path]
+    return _cleaned
 
-            continue
+  @classmethod
+  def delete_with_indexes(cls, key, writes, **kwargs):
 
-        elif len(i) == 2:  # simple set index
-          # extract write, clean
-          index, value = i
+    """ Delete an entity by Key, cleaning its indexes in the same go. Walks
+        the reverse index for ``key`` exactly once, tearing it down as it
+        cleans each forward index entry.
 
-          if index in _metadata and value in _metadata[index]:
+        :param key: Target ``(encoded, flattened)`` key pair to delete.
 
-            # check sorted-ness
-            svalue = (value, '__sorted__')
-            if svalue in _metadata[index]:
-              sorted_entry = _metadata[index][svalue].get(target)
-              if sorted_entry:
-                _metadata[index][value].remove(sorted_entry)
+        :param writes: Index writes that would be committed if ``key`` was
+          being written, as produced by ``generate_indexes``.
 
-            else:
-              # remove from set at item in mapping
-              _metadata[index][value].remove(target)
+        :param kwargs: Implementation-specific flags/kwargs to the underlying
+          adapter from the application.
 
-            # if there's no keys left in the index, trim it
-            if len(_metadata[index][value]) == 0:  # pragma: no cover
-              del _metadata[index][value]
+        :returns: ``True`` if the entity at ``key`` was found and deleted,
+          ``False`` if the entity could not be found for deletion. """
 
-          continue
+    target, meta, graph = writes  # extract indexes
 
-        elif len(i) == 1:  # simple key mapping
-          if i[0] == '__key__':
-            continue  # skip keys, that's done by `delete()`
-          if target in _metadata[i[0]]:
-            del _metadata[i[0]][target]
+    # detach reverse index up front, entries are cleaned in a single pass
+    reverse = _metadata[cls._reverse_prefix].pop(target, None)
 
-    if target in _metadata[cls._reverse_prefix]:
-      # last step: remove reverse index for key
-      del _metadata[cls._reverse_prefix][target]
+    for entry in itertools.chain(reverse or (), meta):
+      _clean_index_entry(cls, target, (
+        entry if isinstance(entry, tuple) else (entry,)))
 
-    return _cleaned
+    if reverse is not None: _sets.release(reverse)
+    return cls.delete(key, **kwargs)
 
   @classmethod
   def encode_key(cls, joined, flattened):
@@ -635,7 +917,43 @@ class InMemoryAdapter(DirectedGraphAdapter):
     return flattened
 
   @classmethod
-  def execute_query(cls, kind, spec, options, **kwargs):  # pragma: no cover
+  def execute_query(cls, kind, spec, options, **kwargs):
+
+    """ Execute a query, serving repeats from a cache of recent results
+        until the underlying datastore changes.
+
+        :param kind: :py:class:`model.Model` subtype class that we're querying
+          for.
+
+        :param spec: Tuple of ``(filters, sorts)`` to apply for this ``Query``
+          execution run.
+
+        :param options: :py:class:`canteen.model.query.QueryOptions` instance,
+          which specifies query options like a result ``offset`` or ``limit``.
+
+        :param kwargs: Implementation-specific flags/kwargs to the underlying
+          adapter from the application.
+
+        :returns: Results matching ``spec`` for ``kind`` according to
+          ``options``, or an empty ``list`` if no results could be found. """
+
+    # keys-only results are lazy, so they are not cached
+    signature = None if options.keys_only else (
+      _query_signature(kind, spec, options))
+
+    if signature is None:
+      return cls._run_query(kind, spec, options, **kwargs)
+
+    # finished puts and deletes move the cache on to a new generation
+    generation = _queries.generation
+    results = _queries.get(signature)
+    if results is None:
+      results = tuple(cls._run_query(kind, spec, options, **kwargs))
+      _queries.set(signature, results, generation)
+    return list(results)
+
+  @classmethod
+  def _run_query(cls, kind, spec, options, **kwargs):  # pragma: no cover
 
     """ Execute a query across one (or multiple) indexed properties. Collapses
         a symbolic :py:class:`canteen.model.query.Query` object and attempts to
@@ -699,20 +1017,21 @@ class InMemoryAdapter(DirectedGraphAdapter):
         else:
           _filter_val = _f.value
 
-        if isinstance(_f.value.data, _sorted_types):
+        if _is_sorted(_f.value.data):
 
           # convert timestamps
           if isinstance(_f.value.data, (datetime.datetime, datetime.date)):
             _filter_val = _to_timestamp(_f.value.data)
 
           # valued index
-          _index_key = (kind.__name__, _f.target.name)
+          _index_key = _intern_path((kind.__name__, _f.target.name))
           if _index_key in _metadata[cls._index_prefix]:
             _sorted_indexes.append((True, (
               _f.target.name,
               _f.operator,
               _filter_val,
-              _metadata[cls._index_prefix][_index_key])))
+              _metadata[cls._index_prefix][_index_key],
+              _metadata['sorted'].get((cls._index_prefix, _index_key), ()))))
 
         else:
 
@@ -735,42 +1054,50 @@ class InMemoryAdapter(DirectedGraphAdapter):
 
           else:
             # devalued index
-            _index_key = ((kind.__name__, _f.target.name), _f.value.data)
-            if _index_key in _metadata[cls._index_prefix]:
+            _index_column = _metadata[cls._index_prefix].get((
+              kind.__name__, _f.target.name), {})
+            if _f.value.data in _index_column:
               _unsorted_indexes.append((
-                False, (_f, _metadata[cls._index_prefix][_index_key])))
+                False, (_f, _index_column[_f.value.data])))
 
       for group in _index_groups:
         for is_sorted, directive in group:
 
           # sorted indexes
           if is_sorted:
-            target, operator, value, index = directive
-            high_bound = (value if (operator in (
-              query.LESS_THAN, query.LESS_THAN_EQUAL_TO)) else None)
-            low_bound = (value if (operator in (
-              query.GREATER_THAN, query.GREATER_THAN_EQUAL_TO)) else None)
+            target, operator, value, index, values = directive
+
+            # bisect the column's ordered values for the matching range
+            if operator is query.GREATER_THAN:
+              start, end = bisect.bisect_right(values, value), len(values)
 
-            if low_bound and not high_bound:
-              evaluate = lambda bundle: (low_bound < bundle[0])
+            elif operator is query.GREATER_THAN_EQUAL_TO:
+              start, end = bisect.bisect_left(values, value), len(values)
 
-            elif low_bound and high_bound:
-              evaluate = lambda bundle: (low_bound < bundle[0] < high_bound)
+            elif operator is query.LESS_THAN:
+              start, end = 0, bisect.bisect_left(values, value)
 
-            elif high_bound:  # high-bound only
-              evaluate = lambda bundle: (bundle[0] < high_bound)
+            elif operator is query.LESS_THAN_EQUAL_TO:
+              start, end = 0, bisect.bisect_right(values, value)
+
+            elif operator is query.EQUALS:
+              start, end = (
+                bisect.bisect_left(values, value),
+                bisect.bisect_right(values, value))
 
             else:  # invalid filter
               raise RuntimeError('Invalid sorted filter'
                                  ' operation: "%s".' % operator)
 
+            # collect keys for each value in range
+            _matched = set(itertools.chain.from_iterable((
+              index[v] for v in values[start:end])))
+
             if not _q_init:  # no frame yet, initialize
               _q_init = True
-              _data_frame = (
-                set((value for _, value in filter(evaluate, index))))
+              _data_frame = _matched
             else:  # otherwise, filter
-              _data_frame &= (
-                set((value for _, value in filter(evaluate, index))))
+              _data_frame &= _matched
 
           # unsorted indexes
           else:
@@ -783,7 +1110,7 @@ class InMemoryAdapter(DirectedGraphAdapter):
 
               if not _q_init:  # no frame yet, initialize
                 _q_init = True
-                _data_frame = _target
+                _data_frame = set(_target)  # copy, index sets are pooled
               else:
                 # filter against selected target
                 _data_frame &= _target
@@ -795,18 +1122,31 @@ class InMemoryAdapter(DirectedGraphAdapter):
                                   ' during execution.' % _fblock.operator)
 
     elif not filters and not ancestry_parent:
-      # no filters - working with _all_ models of a kind as base
-      _data_frame = _metadata[cls._kind_prefix].get(kind.__name__, set())
+      # no filters - working with _all_ models of a kind as base (copied, as
+      # index sets are pooled and keys-only results are consumed lazily)
+      _data_frame = set(_metadata[cls._kind_prefix].get(kind.__name__, ()))
 
     ## inflate results (keys only)
     if options.keys_only and not _inmemory_filters:
-      _keyify = lambda k: (
-        model.Key.from_urlsafe(k, _persisted=True) if not (
-          isinstance(k, model.Key)) else k)
 
-      return (_keyify(k) for k in _data_frame)
+      def _keyify(k):
+
+        """ Resolve a data frame entry to a :py:class:`model.Key`. Stored
+            entities hold their inflated keys, so there's nothing to decode.
+
+            :param k: Flattened key, :py:class:`model.Key` or encoded key.
 
-    result_entities = []
+            :returns: Inflated :py:class:`model.Key`, or ``None`` if ``k``
+              is a flattened key for an entity that no longer exists. """
+
+        if isinstance(k, model.Key): return k
+        if isinstance(k, basestring):
+          return model.Key.from_urlsafe(k, _persisted=True)
+
+        entity = _datastore.get(k)
+        return entity.key if entity is not None else None
+
+      return (k for k in itertools.imap(_keyify, _data_frame) if k is not None)
 
     if not _data_frame and _inmemory_filters:
       # corner case: no initial data frame but inmemory filters
@@ -816,88 +1156,44 @@ class InMemoryAdapter(DirectedGraphAdapter):
 
       if kind:
         _data_frame = (
-          _metadata['kinds'].get(kind.__name__, {'keys': set()})['keys'])
+          _metadata['kinds'][kind.__name__].keys
+          if kind.__name__ in _metadata['kinds'] else set())
       else: _data_frame = _metadata['keys']
 
-    for n, (key, entity) in (
-          enumerate(((k, _datastore.get(k)) for k in _data_frame))):
+    # resolve window from options (a non-positive limit means no limit)
+    offset = options.offset or 0
+    limit = options.limit if (options.limit and options.limit > 0) else None
+    end = (offset + limit) if limit is not None else None
 
-      # @TODO(sgammon) log ghosts?
-      if not entity: continue  # skip missing entities
+    # pull entities, skipping missing ones and collapsing in-memory filters
+    # @TODO(sgammon) log ghosts?
+    results = (entity for entity in itertools.imap(
+      _datastore.get, _data_frame) if entity and all(
+        _inner_f(entity) for _inner_f in _inmemory_filters))
 
-      # stop if options say so, skip if the options say so
-      if options.limit and n >= options.limit: break
-      if options.offset and n <= options.offset: continue
-      # @TODO(sgammon): make sure we don't get any off-by-ones
-
-      # collapse in-memory filters
-      for _inner_f in _inmemory_filters:
-        if not _inner_f(entity):
-          break
-      else:
-        result_entities.append(entity)
+    if not sorts:
+      # no sorts, so stop as soon as the window is filled
+      return list(itertools.islice(results, offset, end))
 
+    result_entities = list(results)
     if not result_entities: return result_entities  # no need to sort, obvs
 
     ## apply sorts
-    if sorts:
-
-      def do_sort(_sort, results):
-
-        """ Apply a ``sort`` operation to a set of query ``results``.
-
-            :param sort: :py:class:`canteen.model.query.Sort` instance
-              describing the sort operator to be applied and the target
-              ``prop`` to apply it to.
 
-            :param results: ``list`` of datastore ``results`` that have been
-             filtered and retrieved from underlying storage.
+    # results without a value for every sorted property are dropped
+    _sorted_props = [_sort.target.name for _sort in sorts]
+    result_entities = [result for result in result_entities if None not in (
+      getattr(result, prop, None) for prop in _sorted_props)]
 
-            :returns: Query results passed in as ``results``, but sorted
-              according to ``sort``. """
+    # stable-sort by each sort, last to first, so the first one leads
+    for _sort in reversed(sorts):
+      _descending = _sort.operator is not query.ASCENDING
 
-        _sort_i, _sort_frame, _sort_values = set(), [], {}
+      # string sorts are inverted (ascending yields ``Z-A``)
+      if _sort.target.basetype in (basestring, str, unicode):
+        _descending = not _descending
 
-        # build value index and map to keys
-        for result in results:
-          val = getattr(result, _sort.target.name, None)
-          if val is not None:
-            if val not in _sort_values:
-              _sort_i.add(val)  # add to known values
-              _sort_values[val] = set()  # provision value -> obj map
-            _sort_values[val].add(result)  # add to map
+      result_entities.sort(
+        key=attrgetter(_sort.target.name), reverse=_descending)
 
-        _rvs, _fwd = lambda d: reversed(sorted(d)), lambda d: sorted(d)
-
-        if _sort.target.basetype in (basestring, str, unicode):
-          sorter = (_rvs if (_sort.operator is query.ASCENDING) else _fwd)
-
-        else:
-          sorter = (_fwd if (_sort.operator is query.ASCENDING) else _rvs)
-
-        # choose iterator and start sorting
-        for value in sorter(_sort_i):
-
-          # quick optimization: no need to subgroup, just one sort
-          if len(sorts) == 1:
-            for _valued_result in _sort_values[value]:
-              _sort_frame.append(_valued_result)
-
-          # aww, we have to subgroup and subsort
-          if len(sorts) > 1:
-            # add sorted groups of values
-            _sort_frame.append((value, _sort_values[value]))
-        return _sort_frame
-
-      if len(sorts) == 1:
-        return do_sort(sorts[0], result_entities)
-
-      if len(sorts) > 1:
-
-        # sort atop the result of the last sort
-        _sort_base = []
-        for sort in sorts:
-          _sort_base = do_sort(*(
-            sort, (_sort_base and result_entities) or _sort_base))
-        return _sort_base
-    return result_entities
+    return result_entities[offset:end]
@@ -15,6 +15,8 @@
 
 # stdlib
 import datetime
+import threading
+import collections
 
 # adapter API
 from .abstract import KeyMixin
@@ -40,7 +42,15 @@ else:
   pmessage_types = getattr(_p, 'message_types')
 
   # constants
-  _model_impl = {}
+  _cache_limit = 4096  # max entries to hold in each class-keyed cache
+  _cache_lock = threading.Lock()  # guards the bounded caches
+  _model_impl = collections.OrderedDict()
+  _model_coercions = collections.OrderedDict()
+  _message_fields = collections.OrderedDict()
+  _message_parents = {}  # model => models whose messages nest its message
+  _message_children = {}  # model => models whose messages its message nests
+  _enum_impl = {}  # unbounded, as message classes hold on to their enums
+  _rpc_module = _model_module = None  # resolved by `_resolve_modules`
   _field_kwarg = 'field'
   _PROTORPC, _root_message_class = True, pmessages.Message
 
@@ -57,8 +67,8 @@ else:
     datetime.date: pmessages.StringField,
     datetime.datetime: pmessages.StringField}
 
-  # build quick basetype lookup
-  _builtin_basetypes = frozenset(_field_basetype_map.keys())
+  # combination basetypes served by `rpc.StringOrIntegerField`
+  _string_or_integer_basetypes = frozenset(((int, str), (str, int)))
 
   # map fields to explicit names
   _field_explicit_map = {
@@ -69,8 +79,111 @@ else:
     pmessages.IntegerField.__name__: pmessages.IntegerField,  # 'IntegerField'
     pmessages.BooleanField.__name__: pmessages.BooleanField}  # 'BooleanField'
 
-  # build quick builtin lookup
-  _builtin_fields = frozenset(_field_explicit_map.keys())
+
+  # bounded cache reader
+  def _recall(cache, key):
+
+    """ Fetch the value at ``key`` in a bounded ``cache``, marking it as the
+        most-recently used so that hot entries are the last to be evicted.
+
+        :param cache: ``OrderedDict`` to read from.
+        :param key: Key to read.
+
+        :raises KeyError: If nothing is cached at ``key``.
+
+        :returns: Value held at ``key``. """
+
+    with _cache_lock:
+      value = cache.pop(key)
+      cache[key] = value
+      return value
+
+
+  # bounded cache writer
+  def _remember(cache, key, value, evict=None):
+
+    """ Store ``value`` at ``key`` in a bounded, least-recently-used ``cache``,
+        evicting the stalest entries past ``_cache_limit``, so that models which
+        are redefined at runtime don't pin their stale classes forever. Access
+        holds ``_cache_lock``, as ``OrderedDict`` is not thread-safe.
+
+        :param cache: ``OrderedDict`` to store ``value`` in.
+        :param key: Key to store ``value`` at.
+        :param value: Value to store, unless one is already present.
+        :param evict: Callable to notify of each ``(key, value)`` evicted,
+          with ``_cache_lock`` held.
+
+        :returns: Value held at ``key`` (the first one in wins, if threads race
+          to build it). """
+
+    with _cache_lock:
+      value = cache.setdefault(key, value)
+      while len(cache) > _cache_limit:
+        stale = cache.popitem(last=False)
+        if evict is not None: evict(*stale)
+      return value
+
+
+  # nested message tracker
+  def _nest(parent, children):
+
+    """ Record the models whose message classes are nested (by way of a
+        ``MessageField``) in the message class for ``parent``, so that they
+        can be evicted together.
+
+        :param parent: Model class whose message class was just built.
+        :param children: Model classes nested in ``parent``'s message class.
+
+        :returns: ``None``. """
+
+    with _cache_lock:
+      _message_children[parent] = children
+      for child in children:
+        _message_parents.setdefault(child, set()).add(parent)
+
+
+  # nested message evictor
+  def _forget_message(_model, message):
+
+    """ Drop everything cached about an evicted message class. Message classes
+        nesting it point at the evicted class, and would not accept messages of
+        the class built to replace it, so they are evicted along with it. Must
+        be called with ``_cache_lock`` held.
+
+        :param _model: Model class evicted from ``_model_impl``.
+        :param message: Message class built for ``_model``.
+
+        :returns: ``None``. """
+
+    _message_fields.pop(message, None)
+
+    for child in _message_children.pop(_model, ()):
+      parents = _message_parents.get(child)
+      if parents is not None:
+        parents.discard(_model)
+        if not parents: del _message_parents[child]
+
+    for parent in _message_parents.pop(_model, ()):
+      stale = _model_impl.pop(parent, None)
+      if stale is not None: _forget_message(parent, stale)
+
+
+  # lazy module resolver
+  def _resolve_modules():
+
+    """ Resolves :py:mod:`canteen.rpc` and :py:mod:`canteen.model`, which
+        cannot be imported at load time as they depend on this module. They
+        are imported once, on first use, and held at module level after.
+
+        :returns: Tuple of ``(rpc, model)`` modules. """
+
+    global _rpc_module, _model_module
+
+    if _rpc_module is None:
+      from canteen import rpc
+      from canteen import model
+      _rpc_module, _model_module = rpc, model
+    return _rpc_module, _model_module
 
 
   # recursive message builder
@@ -92,15 +205,16 @@ else:
         :returns: Constructed (but not instantiated)
           :py:class:`protorpc.messages.Message` class. """
 
-    # must nest import to avoid circular dependencies
-    from canteen import rpc
-    from canteen import model
+    # must resolve lazily to avoid circular dependencies
+    rpc, model = _resolve_modules()
 
-    # provision field increment and message map
-    _field_i, _model_message = 1, {'__module__': _model.__module__}
+    # provision field increment, message map and nested models
+    _field_i, _model_message, children = (
+      1, {'__module__': _model.__module__}, [])
 
-    # grab lookup and property dict
-    lookup, property_map = _model.__lookup__, {}
+    # grab lookup, property dict and class namespace (bound once for the loop)
+    lookup, property_map, namespace = _model.__lookup__, {}, _model.__dict__
+    basetype_fields, explicit_fields = _field_basetype_map, _field_explicit_map
 
     # add key submessage
     _model_message['key'] = pmessages.MessageField(rpc.Key, _field_i)
@@ -108,14 +222,14 @@ else:
     # build fields from model properties
     for name in lookup:
 
-      # init args and kwargs
-      _pargs, _pkwargs = [], {}
+      # init kwargs (positional args are only ever explicit)
+      _pkwargs = {}
 
       # grab property class
-      prop = property_map[name] = _model.__dict__[name]
+      prop = property_map[name] = namespace[name]
 
       # copy in default if field has explicit default value
-      if prop.default != prop.sentinel:
+      if prop.has_default:
         _pkwargs['default'] = prop.default
 
       # map in required and repeated kwargs
@@ -126,7 +240,8 @@ else:
       if _field_kwarg in prop.options:
 
         # grab explicit field, if any
-        explicit = prop.options.get(_field_kwarg, datastructures.EMPTY)
+        explicit, _pargs = (
+          prop.options.get(_field_kwarg, datastructures.EMPTY), ())
 
         # explcitly setting `False` or `None` means skip this field
         if explicit is False or explicit is None:  # pragma: no cover
@@ -153,24 +268,13 @@ else:
             explicit, _pargs, _pkwargs = explicit
 
         # grab explicit field (if it's not a tuple it's a basestring)
-        if explicit in _builtin_fields:
-
-          # flatten arguments, splice in ID
-          if len(_pargs) > 0:
-            if not isinstance(_pargs, list):
-              _pargs = [i for i in _pargs]
-
-            _field_i += 1
-            _pargs.append(_field_i)
-            _pargs = tuple(_pargs)
-          else:
-            # shortcut: replace it if there's no args
-            _field_i += 1
-            _pargs = (_field_i,)
-
-          # factory field
-          _model_message[name] = (
-            _field_explicit_map[explicit](*_pargs, **_pkwargs))
+        field = explicit_fields.get(explicit)
+        if field is not None:
+
+          # factory field, splicing in ID after any explicit args
+          _field_i += 1
+          _model_message[name] = field(*(
+            tuple(_pargs) + (_field_i,)), **_pkwargs)
           continue
 
         else:
@@ -198,21 +302,18 @@ else:
 
         # recurse - it's a model class
         _field_i += 1
-        _pargs.append(prop.basetype.to_message_model())
-        _pargs.append(_field_i)
-
-        # factory
-        _model_message[name] = pmessages.MessageField(*_pargs, **_pkwargs)
+        children.append(prop.basetype)
+        _model_message[name] = pmessages.MessageField(*(
+          prop.basetype.to_message_model(), _field_i), **_pkwargs)
         continue
 
       # handle int/str combination fields
       elif isinstance(prop.basetype, tuple) and (
-            prop.basetype in ((int, str), (str, int))):
+            prop.basetype in _string_or_integer_basetypes):
 
         # build field and advance
         _field_i += 1
-        _pargs.append(_field_i)
-        _model_message[name] = rpc.StringOrIntegerField(*_pargs, **_pkwargs)
+        _model_message[name] = rpc.StringOrIntegerField(_field_i, **_pkwargs)
         continue
 
       # check for keys (implemented with `basestring` for now)
@@ -220,52 +321,51 @@ else:
 
         # build field and advance
         _field_i += 1
-        _pargs.append(rpc.Key)
-        _pargs.append(_field_i)
-        _model_message[name] = pmessages.MessageField(*_pargs)
+        _model_message[name] = pmessages.MessageField(rpc.Key, _field_i)
         continue
 
       # check for enums
       elif issubclass(prop.basetype, datastructures.BidirectionalEnum):
 
-        # build enum class, field, and advance
+        # build enum class (shared per enum), field, and advance
         _field_i += 1
-        _enum = pmessages.Enum.__metaclass__.__new__(*(
-          pmessages.Enum.__metaclass__,
-          prop.basetype.__name__,
-          (pmessages.Enum,),
-          {k: v for k, v in prop.basetype}))
-        _pargs.append(_enum)
-        _pargs.append(_field_i)
+        try:
+          _enum = _enum_impl[prop.basetype]
+        except KeyError:
+          _enum = _enum_impl.setdefault(prop.basetype, (
+            pmessages.Enum.__metaclass__.__new__(*(
+              pmessages.Enum.__metaclass__,
+              prop.basetype.__name__,
+              (pmessages.Enum,),
+              dict(prop.basetype._members)))))
 
         if prop.default not in (
             model.Property.sentinel, None):  # pragma: no cover
           _pkwargs['default'] = (
             prop.basetype.reverse_resolve(prop.default))
 
-        _model_message[name] = pmessages.EnumField(*_pargs, **_pkwargs)
+        _model_message[name] = pmessages.EnumField(*(
+          _enum, _field_i), **_pkwargs)
         continue
 
       # check builtin basetypes
-      elif prop.basetype in _builtin_basetypes:
+      field = basetype_fields.get(prop.basetype)
+      if field is not None:
 
         # build field and advance
         _field_i += 1
-        _pargs.append(_field_i)
         if 'default' in _pkwargs and prop.basetype in (
               datetime.datetime, datetime.date):
           del _pkwargs['default']  # no support for defaults on date types
-        _model_message[name] = (
-          _field_basetype_map[prop.basetype](*_pargs, **_pkwargs))
+        _model_message[name] = field(_field_i, **_pkwargs)
         continue
 
       # check for builtin hook for message implementation
-      elif hasattr(prop.basetype, '__message__'):
+      if hasattr(prop.basetype, '__message__'):
 
         # delegate field and advance
         _field_i += 1
-        _pargs.append(_field_i)
-        _model_message[name] = prop.basetype.__message__(*_pargs, **_pkwargs)
+        _model_message[name] = prop.basetype.__message__(_field_i, **_pkwargs)
         continue
 
       else:  # pragma: no cover
@@ -274,10 +374,63 @@ else:
                          " \"%s\" of model \"%s\" (found basetype \"%s\")." % (
                           context))
 
-    # construct message class on-the-fly
+    # construct message class on-the-fly, tracking the messages it nests
+    _nest(_model, tuple(children))
     return type(_model.kind(), (pmessages.Message,), _model_message)
 
 
+  # value coercion planner
+  def build_coercions(_model):
+
+    """ Plans value coercions for converting entities of a canteen
+        :py:class:`model.Model` into :py:mod:`protorpc` messages. Properties
+        are inspected once, by basetype, so only values of properties that
+        may actually need conversion are type-checked at message time.
+
+        :param _model: Model class to plan value coercions for.
+
+        :returns: ``dict`` mapping property names to coercion callables, for
+          each property that may hold keys or date/time values. """
+
+    # must resolve lazily to avoid circular dependencies
+    rpc, model = _resolve_modules()
+
+    key_types = (model.Key, model.VertexKey, model.EdgeKey)
+    time_types = (datetime.date, datetime.time, datetime.datetime)
+
+    def coerce_key(value):
+
+      """ Convert keys => ``rpc.Key`` messages. """
+
+      if isinstance(value, key_types):
+        return rpc.Key(id=value.id, kind=value.kind, encoded=value.urlsafe())
+      return value
+
+    def coerce_time(value):
+
+      """ Convert date/time/datetime => ``str``. """
+
+      if isinstance(value, time_types):
+        return value.isoformat()  # pragma: no cover
+      return value
+
+    coercions = {}
+    for name in _model.__lookup__:
+      basetype = _model.__dict__[name].basetype
+
+      if not isinstance(basetype, type(type)):
+        continue  # combination basetypes hold no keys or dates
+
+      # submodel properties may reference their values by key
+      if issubclass(basetype, (model.AbstractKey, model.AbstractModel)):
+        coercions[name] = coerce_key
+
+      elif issubclass(basetype, time_types):
+        coercions[name] = coerce_time
+
+    return coercions
+
+
   ## ProtoRPCKey
   class ProtoRPCKey(KeyMixin):
 
@@ -289,20 +442,17 @@ else:
 
           :returns: Constructed :py:class:`protorpc.Key` message object. """
 
-      from canteen import rpc
-
-      args = {
-        'id': self.id,
-        'kind': self.kind,
-        'encoded': self.urlsafe()}
+      rpc, _ = _resolve_modules()
+      parent = self.parent
 
-      if self.parent:
-        if encoded:
-          # indication from outer method that we should only encode
-          return rpc.Key(**args)  # pragma: no cover
-        args['parent'] = self.parent.to_message(not flat, flat)
+      # fast path: root keys (and encode-only requests) need no parent
+      if not parent or encoded:
+        return rpc.Key(id=self.id, kind=self.kind, encoded=self.urlsafe())
 
-      return rpc.Key(**args)
+      return rpc.Key(id=self.id,
+                     kind=self.kind,
+                     encoded=self.urlsafe(),
+                     parent=parent.to_message(not flat, flat))
 
     @classmethod
     def to_message_model(cls):
@@ -311,20 +461,29 @@ else:
 
           :returns: Vanilla :py:class:`protorpc.Key` class. """
 
-      from canteen import rpc
+      rpc, _ = _resolve_modules()
       return rpc.Key
 
     @classmethod
     def from_message(cls, key_message):
 
-      """  """
+      """ Convert a ProtoRPC `Key` message (and its parents) to a `Key`.
+
+          :param key_message: :py:class:`protorpc.Key` message object.
+
+          :returns: Inflated :py:class:`model.Key` object. """
 
-      parent = cls.from_message(key_message.parent) if (
-        key_message.parent
-      ) else None
+      # collect the ancestry chain, from the key itself up to its root
+      chain = []
+      while key_message:
+        chain.append(key_message)
+        key_message = key_message.parent
 
-      # decode recursively for parent key, if specified
-      return cls(key_message.kind, key_message.id, parent=parent)
+      # decode from the root downward, parenting each key to the last
+      key = None
+      for key_message in reversed(chain):
+        key = cls(key_message.kind, key_message.id, parent=key)
+      return key
 
 
   ## ProtoRPCModel
@@ -345,45 +504,29 @@ else:
           :returns: Constructed and initialized :py:class:`protorpc.Message`
             object. """
 
-      # must import inline to avoid circular dependency
-      from canteen import rpc
-      from canteen import model
+      # resolve value coercions for this model (planned once per class)
+      try:
+        coercions = _recall(_model_coercions, self.__class__)
+      except KeyError:
+        coercions = _remember(*(
+          _model_coercions, self.__class__, build_coercions(self.__class__)))
 
       values = {}
-      for prop, value in self.to_dict(*args,
-                                      convert_keys=False, **kwargs).items():
-
-        # convert keys => urlsafe
-        if isinstance(value, (model.Key, model.VertexKey, model.EdgeKey)):
-          values[prop] = rpc.Key(
-            id=value.id,
-            kind=value.kind,
-            encoded=value.urlsafe())
-          continue
-
-        # convert date/time/datetime => string
-        if isinstance(value, (datetime.date, datetime.time, datetime.datetime)):
-          values[prop] = value.isoformat()  # pragma: no cover
-          continue  # pragma: no cover
+      for prop, value in self.to_dict_iter(*args,
+                                           convert_keys=False, **kwargs):
 
-        values[prop] = value  # otherwise, just set it
+        # convert keys => messages, date/time/datetime => string
+        coerce = coercions.get(prop)
+        values[prop] = coerce(value) if coerce else value
 
       if self.key:
         return self.__class__.to_message_model()(
           key=self.key.to_message(), **values)
 
-      def _check_value(item):
-
-        """ Checks for invalid ProtoRPC values. """
-
-        key, value = item
-
-        if isinstance(value, list) and len(value) == 0:
-          return False  # pragma: no cover
-        return True
-
-      filtered = filter(_check_value, values.iteritems())
-      return self.__class__.to_message_model()(**dict(filtered))
+      # filter out invalid ProtoRPC values (empty lists)
+      return self.__class__.to_message_model()(**{
+        k: v for k, v in values.iteritems() if not (
+          isinstance(v, list) and not v)})
 
     @classmethod
     def to_message_model(cls):
@@ -396,16 +539,13 @@ else:
             :py:class:`message.Message` class corresponding to
             the current model (``cls``). """
 
-      global _model_impl
-
-      # check global model=>message implementation cache
-      if (cls, cls.__lookup__) not in _model_impl:
-
+      # check global model=>message implementation cache (model schemas are
+      # fixed at class creation, so the class itself is a stable key)
+      try:
+        return _recall(_model_impl, cls)
+      except KeyError:
         # build message class
-        _model_impl[(cls, cls.__lookup__)] = build_message(cls)
-
-      # return from cache
-      return _model_impl[(cls, cls.__lookup__)]
+        return _remember(_model_impl, cls, build_message(cls), _forget_message)
 
     @classmethod
     def from_message(cls, message):
@@ -419,12 +559,15 @@ else:
 
       model = cls(key=key) if key else cls()
 
-      # decode field values
-      for field, value in ((
-        k.name, message.get_assigned_value(k.name)) for k in (
-            message.all_fields())):
+      # resolve field names for this message type (collected once per type)
+      try:
+        fields = _recall(_message_fields, message.__class__)
+      except KeyError:
+        fields = _remember(_message_fields, message.__class__, tuple((
+          k.name for k in message.all_fields() if k.name != 'key')))
 
-        if field is not 'key':
-          model[field] = value
+      # decode field values
+      for field in fields:
+        model[field] = message.get_assigned_value(field)
 
       return model
@@ -15,8 +15,10 @@
 
 # stdlib
 import json
-import base64
+import hashlib
+import binascii
 import datetime
+import itertools
 import collections
 from operator import itemgetter
 
@@ -37,8 +39,19 @@ _server_profiles = {}  # holds globally-configured server profiles
 _default_profile = None  # holds the default redis instance mapping
 _client_connections = {}  # holds instantiated redis connection clients
 _profiles_by_model = {}  # holds specific model => redis instance mappings
+_time_property_cache = {}  # holds model => date/time property names
+_client_methods = {}  # holds operation => client method name mappings
+_kinded_keys = {}  # holds (kind, key class) => flattened kind-only keys
+_model_module = None  # holds `canteen.model`, resolved by `_resolve_model`
+_write_digests = collections.OrderedDict()  # holds key => last written digest
+_WRITE_DIGEST_LIMIT = 4096  # max keys to remember written digests for
+_encoded_keys = {}  # holds joined => encoded key mappings
+_ENCODED_KEY_LIMIT = 4096  # max encoded keys to hold before flushing
+_QUERY_BATCH_SIZE = 1000  # max matching entities to fetch per query batch
 _SERIES_BASETYPES = (  # basetypes that should be stored as a sorted set
   datetime.datetime, datetime.date, float)
+_TIME_BASETYPES = (  # basetypes that must be stringified before serializing
+  datetime.date, datetime.time, datetime.datetime)
 
 
 ##### ==== runtime ==== #####
@@ -51,6 +64,12 @@ try:
 except ImportError:  # pragma: no cover
   _support.redis, _redis_client, redis = False, None, None
 
+# resolve hiredis (picked up by redis-py as its reply parser, if present)
+try:
+  import hiredis; _support.hiredis = True
+except ImportError:  # pragma: no cover
+  hiredis, _support.hiredis = None, False
+
 # or fakeredis, for testing only
 try:
   import fakeredis; _support.fakeredis = True
@@ -68,6 +87,12 @@ else:  # pragma: no cover
     ## with Redis AND gevent, patch the connection socket / pool
     redis.connection.socket = gevent.socket
 
+# pipeline types, which buffer commands instead of executing them
+_pipeline_types = tuple(impl for impl in (
+  redis and redis.client.Pipeline,
+  redis and redis.client.StrictPipeline,
+  fakeredis and fakeredis.FakePipeline) if impl)
+
 
 ##### ==== serializers ==== #####
 
@@ -97,6 +122,54 @@ try:
   import lz4; _support.lz4 = lz4
 except ImportError:  # pragma: no cover
   lz4, _support.lz4 = None, False
+else:  # pragma: no cover
+  try:
+    ## prefer the frame-less block API, where available
+    import lz4.block; lz4 = _support.lz4 = lz4.block
+  except ImportError:
+    pass  # older releases expose `compress`/`decompress` at the top level
+
+_COMPRESSION_THRESHOLD = 64  # payloads shorter than this are stored as-is
+
+# errors each codec raises when handed a payload it did not compress (values
+# that were too small to compress, or didn't shrink, are stored as-is)
+_codec_errors = dict((codec, error) for codec, error in (
+  (zlib, zlib and zlib.error),
+  (snappy, snappy and getattr(snappy, 'UncompressError', ValueError)),
+  (lz4, lz4 and getattr(lz4, 'LZ4BlockError', ValueError))) if codec)
+
+
+def _resolve_model():
+
+  """ Resolves :py:mod:`canteen.model`, which cannot be imported at load time
+      as it depends on this module. It is imported once, on first use, and held
+      at module level after.
+
+      :returns: The :py:mod:`canteen.model` module. """
+
+  global _model_module
+
+  if _model_module is None:
+    from canteen import model
+    _model_module = model
+  return _model_module
+
+
+def _record_digest(joined, digest):
+
+  """ Remember the digest of a payload just written to ``joined``, so that an
+      identical re-write can be skipped. Only called once the write is known to
+      have succeeded, so a failed or discarded write is never deduplicated.
+
+      :param joined: Joined key the payload was written to.
+
+      :param digest: SHA1 digest of the written payload.
+
+      :returns: ``None``. """
+
+  _write_digests[joined] = digest
+  while len(_write_digests) > _WRITE_DIGEST_LIMIT:
+    _write_digests.popitem(last=False)
 
 
 class RedisMode(object):
@@ -133,9 +206,13 @@ class RedisAdapter(DirectedGraphAdapter):
     """ Configuration for the `RedisAdapter` engine. """
 
     encoding = True  # encoding for keys and special values
-    serializer = json  # json or msgpack
-    compression = False  # compression for serialized data values
+    serializer = msgpack or json  # json or msgpack
+    compression = False  # compress values: `True` for zlib, or a codec module
     mode = RedisMode.toplevel_blob  # internal mode of operation
+    # skip re-writing entities this process last wrote with the same payload.
+    # UNSAFE if anything else writes these keys: another writer's changes are
+    # never noticed, and would not be overwritten by an identical put.
+    dedupe_writes = False
 
 
   class Operations(object):
@@ -347,12 +424,109 @@ class RedisAdapter(DirectedGraphAdapter):
   @decorators.classproperty
   def compressor(cls):  # pragma: no cover
 
-    """ Load and return the optimal data compressor.
+    """ Load and return the configured data compressor. Nothing in a stored
+        payload records the codec that compressed it, so the codec is never
+        picked based on what happens to be installed.
 
         :returns: Currently-configured compressor, mounted statically at
-          ``cls.EngineConfig.compression``. """
+          ``cls.EngineConfig.compression``, or ``zlib`` if compression is
+          simply switched on. """
+
+    compression = cls.EngineConfig.compression
+    if hasattr(compression, 'compress'):  # pragma: no cover
+      return compression  # explicitly-configured compressor
+    return zlib
+
+  @staticmethod
+  def _time_properties(model):
 
-    return cls.EngineConfig.compression or zlib
+    """ Plan which properties of a model may hold date/time values, so that
+        ``put`` only has to type-check those. Properties are inspected once
+        per model, by basetype.
+
+        :param model: Schema :py:class:`model.Model` class to inspect.
+
+        :returns: ``tuple`` of property names with date/time basetypes. """
+
+    try:
+      return _time_property_cache[model]
+    except KeyError:
+      basetypes = (
+        (name, model.__dict__[name].basetype) for name in model.__lookup__)
+
+      return _time_property_cache.setdefault(model, tuple(
+        name for name, basetype in basetypes if isinstance(basetype, type) and (
+          issubclass(basetype, _TIME_BASETYPES))))
+
+  @staticmethod
+  def _kinded_key(kind, key_class=None):
+
+    """ Resolve the joined and flattened forms of the bare key for a given
+        kind, which prefixes all entity keys of that kind. These never change,
+        so they are computed once per kind.
+
+        :param kind: String :py:class:`model.Model` kind.
+
+        :param key_class: Key class to build the kinded key with. Defaults to
+          ``None``, indicating :py:class:`model.Key`.
+
+        :returns: ``tuple`` of ``(joined, flattened)`` for the kinded key. """
+
+    try:
+      return _kinded_keys[(kind, key_class)]
+    except KeyError:
+      impl = key_class or _resolve_model().Key
+      return _kinded_keys.setdefault(*(
+        (kind, key_class), impl(kind).flatten(True)))
+
+  @staticmethod
+  def _entity_group(key):
+
+    """ Split a key into its entity group (root) key and the remainder of
+        its path, as used to address entities in ``hashkey_blob`` mode. The
+        root is found by walking parents directly, rather than by way of the
+        recursive ``ancestry`` generator.
+
+        :param key: :py:class:`model.Key` to split.
+
+        :returns: ``tuple`` of ``(root, tail)``, where ``root`` is the joined
+          and flattened root key, and ``tail`` is the rest of the joined key,
+          or ``'__root__'`` if ``key`` is itself a root key. """
+
+    root = key
+    while root.parent: root = root.parent
+    root = root.flatten(True)
+    return root, key.flatten(True)[0].replace(root[0], '') or '__root__'
+
+  @classmethod
+  def _stored(cls, key, entity):
+
+    """ Check whether an entity is still present in Redis, before a write is
+        skipped as a duplicate. Catches entities removed behind this process'
+        back, by ``DEL``, ``FLUSHDB``, eviction or expiry.
+
+        :param key: ``(encoded, flattened)`` key pair for ``entity``.
+        :param entity: Entity :py:class:`model.Model` about to be written.
+
+        :returns: Truthy if a value is stored for ``entity``. """
+
+    joined, flattened = key
+    mode = cls.EngineConfig.mode
+
+    if mode == RedisMode.toplevel_blob:
+      return cls.execute(cls.Operations.EXISTS, flattened[1], joined)
+
+    if mode == RedisMode.hashkind_blob:
+      root = cls._kinded_key(flattened[1])
+      tail = entity.key.flatten(True)[0].replace(root[0], '')
+    else:
+      root, tail = cls._entity_group(entity.key)
+
+    return cls.execute(*(
+      cls.Operations.HASH_EXISTS,
+      flattened[1],
+      cls.encode_key(*root),
+      cls.encode_key(tail, flattened)))
 
   @classmethod
   def acquire(cls, name, bases, properties):
@@ -457,6 +631,11 @@ class RedisAdapter(DirectedGraphAdapter):
         # if it's a string, it's a pointer to a profile
         profile = _server_profiles[default_profile]
 
+      if not _support.hiredis:
+        cls.logging.warning('Redis replies are being parsed in pure Python,'
+                            ' which is slow for large batches. Please'
+                            ' `pip install hiredis` for production use.')
+
       client = _client_connections['__default__'] = impl(**profile)
       return client
 
@@ -490,31 +669,36 @@ class RedisAdapter(DirectedGraphAdapter):
         :returns: Result of the selected low-level operation. """
 
     # defer to pipeline or resolve channel for kind
-    target = kwargs.get('target', None)
+    target = kwargs.pop('target', None)
     if target is None: target = cls.channel(kind)
 
-    if operation == cls.Operations.DELETE:
-      # special case: `delete` instead of `del` (because it's a keyword)
-      operation = 'DELETE'
+    if operation in (cls.Operations.FLUSH_DB, cls.Operations.FLUSH_ALL):
+      _write_digests.clear()  # every deduplicated write is gone
 
-    if 'target' in kwargs: del kwargs['target']
+    try:
+      method = _client_methods[operation]
+    except KeyError:
+      if operation == cls.Operations.DELETE:
+        # special case: `delete` instead of `del` (because it's a keyword)
+        method = 'delete'
+      elif isinstance(operation, tuple):  # pragma: no cover
+        # (CLIENT, KILL) => "client_kill"
+        method = '_'.join(map(unicode, operation)).lower()
+      else:
+        method = operation.lower()
+      method = _client_methods.setdefault(operation, str(method))
 
     try:
-      if isinstance(operation, tuple):  # pragma: no cover
-        # (CLIENT, KILL) => "CLIENT KILL"
-        operation = '_'.join(map(unicode, operation))
-      if isinstance(target, (_redis_client.client.Pipeline,
-                             _redis_client.client.StrictPipeline)) or (
-              fakeredis and isinstance(target, fakeredis.FakePipeline)):
-        getattr(target, operation.lower())(*args, **kwargs)
+      if isinstance(target, _pipeline_types):
+        getattr(target, method)(*args, **kwargs)
         return target
       if operation == cls.Operations.HASH_SET:  # pragma: no cover
-        r = getattr(target, operation.lower())(*args, **kwargs)
+        r = getattr(target, method)(*args, **kwargs)
         if r in (0, 1):
           # count 0 and 1 as success, as it indicates an overwrite,
           # not a failure
           return 1
-      return getattr(target, operation.lower())(*args, **kwargs)
+      return getattr(target, method)(*args, **kwargs)
     except Exception:  # pragma: no cover
       raise
 
@@ -533,10 +717,11 @@ class RedisAdapter(DirectedGraphAdapter):
 
     # account for none, optionally decompress
     if cls.EngineConfig.compression:  # pragma: no cover
+      codec = cls.compressor
       try:
-        result = cls.compressor.decompress(result)
-      except:
-        pass  # maybe entity is uncompressed? will fail during deserialization
+        result = codec.decompress(result)
+      except _codec_errors.get(codec, ValueError):
+        pass  # entity was stored uncompressed (too small, or didn't shrink)
 
     # deserialize structures
     return cls.serializer.loads(result)
@@ -558,16 +743,13 @@ class RedisAdapter(DirectedGraphAdapter):
         :returns: The deserialized and decompressed entity associated with the
           target ``key``. """
 
-    from canteen import model
+    model, mode = _resolve_model(), cls.EngineConfig.mode
 
     if key:
       encoded, flattened = key
 
-      # @TODO(sgammon): access to structured keys in adapters
-      joined, _ = model.Key.from_urlsafe(encoded).flatten(True)
-
       ## toplevel_blob
-      if cls.EngineConfig.mode == RedisMode.toplevel_blob:
+      if mode == RedisMode.toplevel_blob:
 
         # execute query
         result = _entity or (
@@ -576,10 +758,13 @@ class RedisAdapter(DirectedGraphAdapter):
                         target=pipeline))
 
       ## hashkind_blob
-      elif cls.EngineConfig.mode == RedisMode.hashkind_blob:
+      elif mode == RedisMode.hashkind_blob:
+
+        # @TODO(sgammon): access to structured keys in adapters
+        joined, _ = model.Key.from_urlsafe(encoded).flatten(True)
 
         # generate kinded key and trim tail
-        j_kinded, f_kinded = model.Key(flattened[1]).flatten(True)
+        j_kinded, f_kinded = cls._kinded_key(flattened[1])
         tail = joined.replace(j_kinded, '')
 
         result = _entity or (
@@ -590,30 +775,25 @@ class RedisAdapter(DirectedGraphAdapter):
             cls.encode_key(tail, flattened)), target=pipeline))
 
       ## hashkey_blob
-      elif cls.EngineConfig.mode == RedisMode.hashkey_blob:
+      elif mode == RedisMode.hashkey_blob:
 
         # build key and extract group
-        desired_key = model.Key.from_raw(joined)
-        root = (ancestor for ancestor in desired_key.ancestry).next()
-        tail = (
-          desired_key.flatten(True)[0].replace(root.flatten(True)[0], '') or (
-            '__root__'))
+        root, tail = cls._entity_group(model.Key.from_urlsafe(encoded))
 
         result = _entity or (
           cls.execute(*(
             cls.Operations.HASH_GET,
             flattened[1],
-            cls.encode_key(*root.flatten(True)),
+            cls.encode_key(*root),
             cls.encode_key(tail, flattened)), target=pipeline))
 
       ## hashkey_hash
-      elif cls.EngineConfig.mode == RedisMode.hashkey_hash:  # pragma: no cover
+      elif mode == RedisMode.hashkey_hash:  # pragma: no cover
 
         raise NotImplementedError('Redis mode not implemented: "hashkey_hash".')
 
       else:  # pragma: no cover
-        raise NotImplementedError("Unknown storage mode: '%s'." % (
-                                                        cls.EngineConfig.mode))
+        raise NotImplementedError("Unknown storage mode: '%s'." % mode)
 
     else:  # pragma: no cover
       result = _entity
@@ -639,138 +819,136 @@ class RedisAdapter(DirectedGraphAdapter):
         :returns: The deserialized and decompressed entity associated with the
           target ``key``. """
 
-    from canteen import model
+    model, mode = _resolve_model(), cls.EngineConfig.mode
 
     if keys:
       requested_keys = keys
-      results, calls, bundles, handler = {}, [], [], {
+      bundles, roots, handler = [], {}, {
           RedisMode.toplevel_blob: cls.Operations.MULTI_GET,
           RedisMode.hashkind_blob: cls.Operations.HASH_MULTI_GET,
           RedisMode.hashkey_blob: cls.Operations.HASH_MULTI_GET,
           RedisMode.hashkey_hash: cls.Operations.HASH_GET_ALL
-        }.get(cls.EngineConfig.mode)
+        }.get(mode)
 
-      # # plan reads
-      for _k in keys:
-        encoded, flattened = _k
+      # # plan reads, tracking each by its position in the request
+      for _k, (encoded, flattened) in enumerate(keys):
 
-        if cls.EngineConfig.mode == RedisMode.toplevel_blob:
+        if mode == RedisMode.toplevel_blob:
           bundles.append((flattened[1], encoded, _k))
 
-        elif cls.EngineConfig.mode == RedisMode.hashkind_blob:
+        elif mode == RedisMode.hashkind_blob:
           # @TODO(sgammon): access to structured keys in adapters
           joined, _ = model.Key.from_urlsafe(encoded).flatten(True)
 
-          # generate kinded key and trim tail
-          j_kinded, f_kinded = model.Key(flattened[1]).flatten(True)
+          # generate kinded key (encoded once per kind) and trim tail
+          if flattened[1] not in roots:
+            j_kinded, f_kinded = cls._kinded_key(flattened[1])
+            roots[flattened[1]] = (j_kinded, cls.encode_key(j_kinded, f_kinded))
+          j_kinded, encoded_root = roots[flattened[1]]
           tail = joined.replace(j_kinded, '')
 
           # encode
-          encoded_root, encoded_tail = (
-            cls.encode_key(j_kinded, f_kinded),
-            cls.encode_key(tail, flattened))
+          encoded_tail = cls.encode_key(tail, flattened)
 
           bundles.append((flattened[1], encoded_root, encoded_tail, _k))
 
-        elif cls.EngineConfig.mode == RedisMode.hashkey_blob:
+        elif mode == RedisMode.hashkey_blob:
           # @TODO(sgammon): access to structured keys in adapters
-          joined, _target = model.Key.from_urlsafe(encoded).flatten(True)
-
           # build key and extract group
-          desired_key = model.Key.from_raw(joined)
-          root = (ancestor for ancestor in desired_key.ancestry).next()
-          tail = (
-            desired_key.flatten(True)[0].replace(root.flatten(True)[0], '') or (
-              '__root__'))
+          root, tail = cls._entity_group(model.Key.from_urlsafe(encoded))
 
           encoded_root, encoded_tail = (
-            cls.encode_key(*root.flatten(True)),
+            cls.encode_key(*root),
             cls.encode_key(tail, flattened))
 
           bundles.append((flattened[1], encoded_root, encoded_tail, _k))
 
-        elif cls.EngineConfig.mode == RedisMode.hashkey_hash:
+        elif mode == RedisMode.hashkey_hash:
           raise NotImplementedError('Redis mode not implemented:'
                                     ' "hashkey_hash.')  # pragma: no cover
 
-      ## merge reads
-      kinds, keys, expected, requested = (
-        set(), collections.OrderedDict(), [], collections.OrderedDict())
+      ## merge reads (order is irrelevant, results are matched by position)
+      keys, expected, requested = {}, [], {}
 
       for read in bundles:
-        if cls.EngineConfig.mode == RedisMode.toplevel_blob:
+        if mode == RedisMode.toplevel_blob:
           # merge keys, not kinds (no namespacing by kind so MGET works)
           kind, encoded, _k = read
-          kinds.add(kind)
 
-          if kind not in keys:
-            keys[kind], requested[kind] = [], []
-          keys[kind].append(encoded)
-          requested[kind].append(_k)
+          keys.setdefault(kind, []).append(encoded)
+          requested.setdefault(kind, []).append(_k)
 
-        elif cls.EngineConfig.mode == RedisMode.hashkind_blob or (
-              cls.EngineConfig.mode == RedisMode.hashkey_blob):
+        elif mode in (RedisMode.hashkind_blob, RedisMode.hashkey_blob):
           kind, root, tail, _k = read
 
-          if root not in keys:
-            keys[root], requested[root] = [], []
-          keys[root].append(tail)
-          requested[root].append(_k)
+          keys.setdefault(root, []).append(tail)
+          requested.setdefault(root, []).append(_k)
 
-      # @TODO(sgammon): reads segmented in toplevel by kind, because of routing?
-      pipeline = pipeline or cls.channel('__meta__').pipeline(transaction=False)
-      with pipeline as pipe:
+      if pipeline is None and len(keys) == 1 and (
+            mode == RedisMode.toplevel_blob):
 
-        ## collapse reads
-        if cls.EngineConfig.mode == RedisMode.toplevel_blob:
-          for kind in kinds:
+        # single kind: one bare MGET, no pipeline framing
+        kind = iter(keys).next()
+        expected.append(requested[kind])
+        resultset = [cls.execute(handler, kind, *keys[kind])]
 
-            # track expected keys with calls
-            expected.append([i for i in requested[kind]])
-            cls.execute(handler, kind, *[i for i in keys[kind]], target=pipe)
+      else:
 
-        elif cls.EngineConfig.mode == RedisMode.hashkind_blob or (
-              cls.EngineConfig.mode == RedisMode.hashkey_blob):
-          for root in keys:
+        # @TODO(sgammon): reads segmented in toplevel by kind, for routing?
+        if pipeline is None:  # pipelines with nothing queued are falsy
+          pipeline = cls.channel('__meta__').pipeline(transaction=False)
 
-            _expected, tails = (
-              [r for r in requested[root]], [tail for tail in keys[root]])
+        with pipeline as pipe:
 
-            expected.append(_expected)  # combine into a single call
+          ## collapse reads
+          if mode == RedisMode.toplevel_blob:
+            for kind in keys:
 
-            # if there's only one fetch from this hash, do an HGET instead
-            if len(tails) == 1 and cls.EngineConfig.mode in (
-                  RedisMode.hashkey_blob,
-                  RedisMode.hashkind_blob):
-              _target_handler = cls.Operations.HASH_GET
-            else:
-              _target_handler = handler
-            cls.execute(_target_handler, '__meta__', root, *tails, target=pipe)
+              # track expected keys with calls
+              expected.append(requested[kind])
+              cls.execute(handler, kind, *keys[kind], target=pipe)
 
-        resultset = pipe.execute()  # execute pipeline and inflate
+          elif mode in (RedisMode.hashkind_blob, RedisMode.hashkey_blob):
+            for root in keys:
 
-        for keygroup, item in zip(expected, resultset):
-          if not isinstance(item, (tuple, list)):
-            item = (item,)
+              # combine into a single call per hash
+              expected.append(requested[root])
+              cls.execute(handler, '__meta__', root, *keys[root], target=pipe)
 
-          for key, entity in zip(keygroup, item):
-            results[key] = (
-              cls.inflate(entity) if isinstance(entity, basestring) else entity)
+          # execute pipeline once (raising the first failed read, if any, so
+          # errors aren't mistaken for missing entities)
+          resultset = pipe.execute()
 
-        inflated_results = []
-        for key in requested_keys:
-          entity = results.get(key)
+      # inflate directly into place, resolving model and key classes once per
+      # kind and decoding keys in C
+      registry, models, decode = cls.registry, {}, binascii.a2b_base64
 
-          if not entity:
-            inflated_results.append(None)
-          else:
-            encoded, flattened = key
-            entity['key'] = (
-              cls.registry[flattened[1]].__keyclass__.from_raw(
-                base64.b64decode(encoded)))
+      # without compression, values can go straight to the deserializer
+      inflate = cls.inflate if cls.EngineConfig.compression else (
+        cls.serializer.loads)
+      inflated_results = [None] * len(requested_keys)
 
-            inflated_results.append(
-              cls.registry[flattened[1]](_persisted=True, **entity))
+      for positions, item in zip(expected, resultset):
+        if not isinstance(item, (tuple, list)):  # pragma: no cover
+          item = (item,)
+
+        # MGET/HMGET replies are always bulk strings, or nil for misses
+        for position, entity in zip(positions, item):
+          if entity is None:
+            continue
+          entity = inflate(entity)
+          if not entity:  # pragma: no cover
+            continue
+
+          encoded, flattened = requested_keys[position]
+          kind = flattened[1]
+          if kind not in models:
+            impl = registry[kind]
+            models[kind] = (impl, impl.__keyclass__.from_raw)
+          impl, from_raw = models[kind]
+
+          entity['key'] = from_raw(decode(encoded))
+          inflated_results[position] = impl(_persisted=True, **entity)
 
       return inflated_results
 
@@ -781,9 +959,14 @@ class RedisAdapter(DirectedGraphAdapter):
 
         :param entity: Entity :py:class:`model.Model` to persist.
 
+        :param atomic: Wrap the entity write and its index writes in a
+          ``MULTI``/``EXEC`` transaction. Defaults to ``False``, in which case
+          they are sent as one plain pipelined batch.
+
         :returns: Resulting :py:class:`model.Key` from write operation. """
 
     _indexed_properties = self._pluck_indexed(entity)
+    atomic = kwargs.pop('atomic', False)
 
     # reuse pipeline passed, if any
     if 'pipeline' in kwargs:
@@ -791,17 +974,19 @@ class RedisAdapter(DirectedGraphAdapter):
       del kwargs['pipeline']
     else:
       pipeline = (
-        self.channel(entity.kind()).pipeline(transaction=True))
+        self.channel(entity.kind()).pipeline(transaction=atomic))
 
     # provision ID early if there is none
     if not entity.key.id:
       entity.key.id = self.allocate_ids(entity.__keyclass__, entity.kind())
 
+    digests = {}  # joined => digest, recorded once the pipeline succeeds
+
     with pipeline as pipe:
 
       # delegate write up the chain
-      written_key = super(IndexedModelAdapter, self)._put(entity,
-                                                        pipeline=pipe, **kwargs)
+      written_key = super(IndexedModelAdapter, self)._put(*(
+        entity,), pipeline=pipe, digests=digests, **kwargs)
 
       # proxy to `generate_indexes` and write indexes
       origin, meta, property_map, graph = (
@@ -812,10 +997,12 @@ class RedisAdapter(DirectedGraphAdapter):
 
       # collapse pipelines
       pipe.execute()
+      for joined, digest in digests.iteritems():
+        _record_digest(joined, digest)
       return written_key  # delegate up the chain for entity write
 
   @classmethod
-  def put(cls, key, entity, model, pipeline=None):
+  def put(cls, key, entity, model, pipeline=None, digests=None):
 
     """ Persist an entity to storage in Redis.
 
@@ -833,37 +1020,55 @@ class RedisAdapter(DirectedGraphAdapter):
         :param pipeline: Existing pipeline of queued commands to append to, if
           applicable.
 
-        :returns: Result of the lower-level write operation. """
+        :param digests: When writing to ``pipeline``, a ``dict`` to collect the
+          payload digest in (when deduplicating writes), for the caller to
+          record once the pipeline executes successfully.
 
-    from canteen import model as _model
+        :returns: Result of the lower-level write operation. """
 
     # reduce entity to dictionary
-    serialized = entity if isinstance(entity, dict) else (
+    _cleaned = dict(entity) if isinstance(entity, dict) else (
       entity.to_dict(convert_datetime=False,
                      convert_keys=True,
                      convert_models=True))
     joined, flattened = key
+    mode = cls.EngineConfig.mode
 
-    # clean key types
-    _cleaned = {}
-    for k, v in serialized.iteritems():
-      prop = getattr(model, k)
-      if isinstance(v, (datetime.date, datetime.time, datetime.datetime)):
-        _cleaned[k] = v.isoformat()  # pragma: no cover
-      else:
-        _cleaned[k] = v
+    # clean date/time values, only checking properties that may hold them
+    for name in cls._time_properties(model):
+      value = _cleaned.get(name)
+      if isinstance(value, _TIME_BASETYPES):
+        _cleaned[name] = value.isoformat()  # pragma: no cover
 
     # serialize + optionally compress
     serialized = cls.serializer.dumps(_cleaned)
-    if cls.EngineConfig.compression:  # pragma: no cover
+    if cls.EngineConfig.compression and (
+          len(serialized) >= _COMPRESSION_THRESHOLD):  # pragma: no cover
       compressed = cls.compressor.compress(serialized)
 
       if len(compressed) < len(serialized):
         # we saved space, store it compressed and it should uncompress on `get`
         serialized = compressed
 
+    # skip the write entirely if this process last wrote the same payload,
+    # and it's still there (only safe if nothing else writes these keys)
+    digest = None
+    if cls.EngineConfig.dedupe_writes:  # pragma: no cover
+      digest = hashlib.sha1(serialized).digest()
+      if _write_digests.get(joined) == digest:
+        if cls._stored(key, entity):
+          entity._set_persisted(True)
+          return entity.key
+        del _write_digests[joined]  # removed externally, write it again
+
+      if pipeline is not None:
+        # defer to the pipeline's owner, which knows whether it succeeded
+        if digests is not None:
+          digests[joined] = digest
+        digest = None
+
     # toplevel_blob
-    if cls.EngineConfig.mode == RedisMode.toplevel_blob:
+    if mode == RedisMode.toplevel_blob:
 
       # delegate to redis client
       if cls.execute(*(
@@ -871,6 +1076,8 @@ class RedisAdapter(DirectedGraphAdapter):
           flattened[1],
           joined,
           serialized), target=pipeline):
+        if digest is not None:
+          _record_digest(joined, digest)
         entity._set_persisted(True)
         return entity.key
       else:  # pragma: no cover
@@ -880,10 +1087,10 @@ class RedisAdapter(DirectedGraphAdapter):
     ## need a serialized blob...
 
     ## hashkind_blob
-    if cls.EngineConfig.mode == RedisMode.hashkind_blob:
+    if mode == RedisMode.hashkind_blob:
 
       # generate kinded key and trim tail
-      kinded = _model.Key(flattened[1]).flatten(True)
+      kinded = cls._kinded_key(flattened[1])
       tail = entity.key.flatten(True)[0].replace(kinded[0], '')
 
       # delegate to redis client
@@ -893,6 +1100,8 @@ class RedisAdapter(DirectedGraphAdapter):
         cls.encode_key(*kinded),
         cls.encode_key(tail, flattened),
         serialized), target=pipeline):
+        if digest is not None:
+          _record_digest(joined, digest)
         entity._set_persisted(True)
         return entity.key
       else:  # pragma: no cover
@@ -900,11 +1109,10 @@ class RedisAdapter(DirectedGraphAdapter):
           str(entity), str(key) or '<none>'))
 
     ## hashkey_blob
-    elif cls.EngineConfig.mode == RedisMode.hashkey_blob:
+    elif mode == RedisMode.hashkey_blob:
 
       # find entity group key
-      root = (ancestor for ancestor in entity.key.ancestry).next().flatten(True)
-      tail = entity.key.flatten(True)[0].replace(root[0], '') or '__root__'
+      root, tail = cls._entity_group(entity.key)
 
       if cls.execute(*(
         cls.Operations.HASH_SET,
@@ -912,6 +1120,8 @@ class RedisAdapter(DirectedGraphAdapter):
         cls.encode_key(*root),
         cls.encode_key(tail, flattened),
         serialized), target=pipeline):
+        if digest is not None:
+          _record_digest(joined, digest)
         entity._set_persisted(True)
         return entity.key
       else:  # pragma: no cover
@@ -919,12 +1129,12 @@ class RedisAdapter(DirectedGraphAdapter):
           str(entity), str(key) or '<none>'))
 
     ## hashkey_hash
-    elif cls.EngineConfig.mode == RedisMode.hashkey_hash:  # pragma: no cover
+    elif mode == RedisMode.hashkey_hash:  # pragma: no cover
 
       raise NotImplementedError('Redis mode not implemented: "hashkey_hash".')
 
-    raise NotImplementedError("Unknown storage mode: '%s'." % (
-                              cls.EngineConfig.mode))  # pragma: no cover
+    raise NotImplementedError(
+      "Unknown storage mode: '%s'." % mode)  # pragma: no cover
 
     # @TODO: different storage internal modes
 
@@ -940,30 +1150,30 @@ class RedisAdapter(DirectedGraphAdapter):
 
         :returns: The result of the low-level delete operation. """
 
-    from canteen import model
-
-    # @TODO(sgammon): access to structured keys in adapters
+    model, mode = _resolve_model(), cls.EngineConfig.mode
 
     encoded, flattened = key
-    try:
-      joined, _ = model.Key.from_urlsafe(encoded).flatten(True)
-    except TypeError:  # pragma: no cover
-      joined = encoded
-      encoded = cls.encode_key((joined, flattened))
+    _write_digests.pop(encoded, None)  # forget deduplicated writes, if any
 
+    if mode == RedisMode.toplevel_blob:
 
-    if cls.EngineConfig.mode == RedisMode.toplevel_blob:
-
-      # delegate to redis client with encoded key
+      # delegate to redis client with the encoded key, exactly as `put` wrote
       return cls.execute(*(
         cls.Operations.DELETE,
         flattened[1],
-        cls.encode_key(joined, flattened)), target=pipeline)
+        encoded), target=pipeline)
 
-    elif cls.EngineConfig.mode == RedisMode.hashkind_blob:
+    # @TODO(sgammon): access to structured keys in adapters
+    try:
+      desired_key = model.Key.from_urlsafe(encoded)
+      joined, _ = desired_key.flatten(True)
+    except TypeError:  # pragma: no cover
+      desired_key, joined = None, encoded
+
+    if mode == RedisMode.hashkind_blob:
 
       # generate kinded key and trim tail
-      kinded = model.Key(flattened[1]).flatten(True)
+      kinded = cls._kinded_key(flattened[1])
       tail = joined.replace(kinded[0], '')
 
       # delegate to redis client
@@ -973,27 +1183,24 @@ class RedisAdapter(DirectedGraphAdapter):
         cls.encode_key(*kinded),
         cls.encode_key(tail, flattened)), target=pipeline)
 
-    elif cls.EngineConfig.mode == RedisMode.hashkey_blob:
+    elif mode == RedisMode.hashkey_blob:
 
-      # build key and extract group
-      desired_key = model.Key.from_raw(joined)
-      root = (ancestor for ancestor in desired_key.ancestry).next()
-      tail = (
-        desired_key.flatten(True)[0].replace(root.flatten(True)[0], '') or (
-          '__root__'))
+      # extract group, reusing the decoded key where possible
+      root, tail = cls._entity_group(
+        desired_key or model.Key.from_raw(joined))
 
       return cls.execute(*(
         cls.Operations.HASH_DELETE,
           flattened[1],
-          cls.encode_key(*root.flatten(True)),
+          cls.encode_key(*root),
           cls.encode_key(tail, flattened)), target=pipeline)
 
-    elif cls.EngineConfig.mode == RedisMode.hashkey_hash:  # pragma: no cover
+    elif mode == RedisMode.hashkey_hash:  # pragma: no cover
 
       raise NotImplementedError('Redis mode not implemented: "hashkey_hash".')
 
-    raise NotImplementedError("Unknown storage mode: '%s'." % (
-                              cls.EngineConfig.mode))  # pragma: no cover
+    raise NotImplementedError(
+      "Unknown storage mode: '%s'." % mode)  # pragma: no cover
 
   @classmethod
   def allocate_ids(cls, key_class, kind, count=1, pipeline=None):
@@ -1015,32 +1222,30 @@ class RedisAdapter(DirectedGraphAdapter):
 
         :returns: If **only one** ID is requested, an **integer ID** suitable
           for use in a :py:class:`model.Key` directly. If **more than one** ID
-          is requested, a **generator** is returned, which ``yields`` a set of
-          provisioned integer IDs, each suitable for use in a
-          :py:class:`model.Key` directly. """
+          is requested, an ``xrange`` is returned over the set of provisioned
+          integer IDs, each suitable for use in a :py:class:`model.Key`
+          directly. """
 
     if not count:  # pragma: no cover
       raise ValueError("Cannot allocate less than 1 ID's.")
 
-    # generate kinded key to resolve ID pointer
-    kinded_key = key_class(kind)
-    joined, flattened = kinded_key.flatten(True)
+    # resolve kinded key to resolve ID pointer
+    joined, flattened = cls._kinded_key(kind, key_class)
+    mode = cls.EngineConfig.mode
 
-    if cls.EngineConfig.mode == RedisMode.toplevel_blob:
+    if mode == RedisMode.toplevel_blob:
       key_root_id = cls._magic_separator.join([
         cls._meta_prefix, cls.encode_key(joined, flattened)])
 
       # increment by the amount desired
       value = cls.execute(*(
         cls.Operations.HASH_INCREMENT,
-        kinded_key.kind,
+        flattened[1],
         key_root_id,
         cls._id_prefix,
         count), target=pipeline)
 
-    elif cls.EngineConfig.mode in (
-      RedisMode.hashkind_blob,
-      RedisMode.hashkey_blob):
+    elif mode in (RedisMode.hashkind_blob, RedisMode.hashkey_blob):
 
       # store auto-increment for kind in kind's own hash at special field
       # ends up as `__meta__::id` or so
@@ -1054,28 +1259,17 @@ class RedisAdapter(DirectedGraphAdapter):
         cls.encode_key(tail, flattened),
         count), target=pipeline)
 
-    elif cls.EngineConfig.mode == RedisMode.hashkey_hash:  # pragma: no cover
+    elif mode == RedisMode.hashkey_hash:  # pragma: no cover
 
       raise NotImplementedError('Redis mode not implemented: "hashkey_hash".')
 
     else:  # pragma: no cover
 
-      raise NotImplementedError("Unknown storage mode: '%s'." % (
-                                cls.EngineConfig.mode))
+      raise NotImplementedError("Unknown storage mode: '%s'." % mode)
 
     if count > 1:  # pragma: no cover
-      def _generate_range():
-
-        """ Generate a range of requested ID's.
-
-            :yields: Each item in a set of provisioned integer IDs,
-              suitable for use in a :py:class:`model.Key`. """
-
-        bottom_range = (value - count)
-        for i in xrange(bottom_range, value):
-          yield i
-
-      return _generate_range
+      # `value` is the highest ID provisioned by the increment
+      return xrange(value - count + 1, value + 1)
     return value
 
   @classmethod
@@ -1097,11 +1291,17 @@ class RedisAdapter(DirectedGraphAdapter):
           :py:class:`model.Key`, suitable for storage in ``Redis``. Otherwise
           (``encoding`` is *off*), the cleartext ``joined`` key. """
 
-    from canteen import model
+    if isinstance(joined, _resolve_model().Key): return joined.urlsafe()
+    if not cls.EngineConfig.encoding: return joined
 
-    if isinstance(joined, model.Key): return joined.urlsafe()
-    if cls.EngineConfig.encoding: return abstract._encoder(joined)
-    return joined
+    # kind, group and index keys recur constantly, so remember encodings
+    try:
+      return _encoded_keys[joined]
+    except KeyError:
+      if len(_encoded_keys) >= _ENCODED_KEY_LIMIT:
+        _encoded_keys.clear()  # flush wholesale, cheaper than tracking age
+      encoded = _encoded_keys[joined] = abstract._encoder(joined)
+      return encoded
 
   @classmethod
   def write_indexes(cls, w, g, pipeline=None, execute=True):
@@ -1133,18 +1333,30 @@ class RedisAdapter(DirectedGraphAdapter):
 
     origin, meta, property_map = w
 
-    results, indexer_calls = [], []
+    indexer_calls = []
 
-    # resolve target (perhaps a pipeline?)
-    if pipeline:  # pragma: no cover
+    # resolve target (perhaps a pipeline? which is falsy while it's empty)
+    if pipeline is not None:  # pragma: no cover
       target = pipeline
+    elif execute:  # pragma: no cover
+      # batch all index writes into a single (non-transactional) round-trip,
+      # which still applies them in order
+      target = cls.channel(cls._meta_prefix).pipeline(transaction=False)
     else:  # pragma: no cover
       target = cls.channel(cls._meta_prefix)
 
-    handler, ekey_encoder, vkey_encoder = (
+    # bind constants used in the loops below
+    sep, psep, basetypes, dumps, set_add, sorted_add, identity = (
+      cls._magic_separator,
+      cls._path_separator,
+      cls._index_basetypes,
+      cls.serializer.dumps,
       cls.Operations.SET_ADD,
-      cls._index_basetypes[EdgeKey],
-      cls._index_basetypes[VertexKey])
+      cls.Operations.SORTED_ADD,
+      lambda x: x)
+
+    handler, ekey_encoder, vkey_encoder = (
+      set_add, basetypes[EdgeKey], basetypes[VertexKey])
 
     # write graph indexes
     for bundle in g:  # pragma: no cover
@@ -1154,7 +1366,7 @@ class RedisAdapter(DirectedGraphAdapter):
       # one- or two-element tuples are simple indexes (and always edges)
       if 0 < len(bundle) < 3:
         bundle_args.append(Edge)
-        bundle_args.append(cls._magic_separator.join(bundle))
+        bundle_args.append(sep.join(bundle))
         bundle_args.append(origin)
 
       # three-element tuples are encoded key indexes
@@ -1179,9 +1391,7 @@ class RedisAdapter(DirectedGraphAdapter):
         gbase, gtoken, gtarget = tuple(_components)
 
         bundle_args.append(Vertex)
-        bundle_args.append(cls._magic_separator.join((cls._graph_prefix,
-                                                      gbase,
-                                                      gtoken)))
+        bundle_args.append(sep.join((cls._graph_prefix, gbase, gtoken)))
         bundle_args.append(gtarget)
 
       # invalid indexer bundle
@@ -1208,7 +1418,7 @@ class RedisAdapter(DirectedGraphAdapter):
           converter, write = element
 
           # basestring is not allowed to be instantiated
-          if converter is basestring: converter = cls.serializer.dumps
+          if converter is basestring: converter = dumps
 
         ## Unpack index write
         if len(write) > 3:  # qualified value-key-mapping index
@@ -1216,7 +1426,7 @@ class RedisAdapter(DirectedGraphAdapter):
           # extract write, inflate
           index, path, value = write[0], write[1:-1], write[-1]
           hash_c.append(index)
-          hash_c.append(cls._path_separator.join(path))
+          hash_c.append(psep.join(path))
           hash_value = True  # add hashed value later
 
         elif len(write) == 3:  # value-key-mapping index
@@ -1224,7 +1434,7 @@ class RedisAdapter(DirectedGraphAdapter):
           # extract write, inflate
           index, path, value = write
           hash_c.append(index)
-          hash_c.append(cls._path_separator.join(path))
+          hash_c.append(psep.join(path))
           hash_value = True  # add hashed value later
 
         elif len(write) == 2:  # it's a qualified key index
@@ -1253,14 +1463,14 @@ class RedisAdapter(DirectedGraphAdapter):
                                ' Write bundle: "%s".' % write)
 
           # convert things over to floats
-          converter = lambda x: x
+          converter = identity
           if isinstance(value, (datetime.date, datetime.datetime)):
-            converter = cls._index_basetypes[type(value)]
+            converter = basetypes[type(value)]
           elif isinstance(value, (int, long)):
             converter = float
 
           # time-based or number-like values are stored in sorted sets
-          handler = cls.Operations.SORTED_ADD
+          handler = sorted_add
           sanitized_value = converter(value)
 
           if isinstance(sanitized_value, tuple):
@@ -1276,7 +1486,7 @@ class RedisAdapter(DirectedGraphAdapter):
           # @TODO(sgammon): this can cause silent issues
 
           # everything else is stored unsorted
-          handler = cls.Operations.SET_ADD
+          handler = set_add
 
           if converter and value is not None:
             sanitized_value = converter(value)
@@ -1289,16 +1499,16 @@ class RedisAdapter(DirectedGraphAdapter):
 
         # build index key
         indexer_calls.append((handler, tuple([
-          None, cls._magic_separator.join(map(str, hash_c))] + args), {
+          None, sep.join(map(str, hash_c))] + args), {
             'target': target}))
 
     if execute:  # pragma: no cover
       for handler, hargs, hkwargs in indexer_calls:
-        results.append(cls.execute(handler, *hargs, **hkwargs))
+        cls.execute(handler, *hargs, **hkwargs)
 
-      if pipeline:
+      if pipeline is not None:
         return pipeline
-      return results
+      return target.execute()
     return indexer_calls  # pragma: no cover
 
   @classmethod
@@ -1494,6 +1704,9 @@ class RedisAdapter(DirectedGraphAdapter):
       (index, _filters[index]) for index in (
         filter(lambda x: x[0] == 'S', _filters.iterkeys()))])
 
+    # queue all index reads on one pipeline, flushed once below
+    pipe = cls.channel(cls._meta_prefix).pipeline(transaction=False)
+
     if sorted_indexes:
 
       for prop, _directives in sorted_indexes.iteritems():
@@ -1524,14 +1737,14 @@ class RedisAdapter(DirectedGraphAdapter):
 
               # range value query over sorted index
               greater, lesser = max(_values), min(_values)
-              _data_frame.append(cls.execute(*(
+              cls.execute(*(
                 cls.Operations.SORTED_RANGE_BY_SCORE,
                 None,
                 prop,
                 lesser,
                 greater,
                 options.offset,
-                options.limit)))
+                options.limit), target=pipe)
 
               continue
 
@@ -1546,37 +1759,37 @@ class RedisAdapter(DirectedGraphAdapter):
           if _operator is query.EQUALS:
 
             # static value query over sorted index
-            _data_frame.append(cls.execute(*(
+            cls.execute(*(
               cls.Operations.SORTED_RANGE_BY_SCORE,
               None,
               prop,
               _value,
-              _value)))
+              _value), target=pipe)
 
             continue
 
           elif _operator is query.LESS_THAN:
 
             # no lower bound
-            _data_frame.append(cls.execute(
+            cls.execute(
               cls.Operations.SORTED_RANGE_BY_SCORE,
               None,
               prop,
               '-inf',
               float(_value) if not (
-                isinstance(_value, float)) else _value))
+                isinstance(_value, float)) else _value, target=pipe)
 
             continue
 
           elif _operator is query.GREATER_THAN:
             # no lower bound
-            _data_frame.append(cls.execute(
+            cls.execute(
               cls.Operations.SORTED_RANGE_BY_SCORE,
               None,
               prop,
               float(_value) if not (
                 isinstance(_value, float)) else _value,
-              '+inf'))
+              '+inf', target=pipe)
 
             continue
 
@@ -1607,8 +1820,10 @@ class RedisAdapter(DirectedGraphAdapter):
           # @TODO(sgammon): support this query branch
           raise RuntimeError('Specified query is not yet supported.')
 
-      if (_or_filters or _and_filters) and not _data_frame:
-        # couldn't resolve backing indexes - query is naked with and/or
+      if (_or_filters or _and_filters) and not sorted_indexes:
+        # no sorted index reads were queued above (each one queues a read or
+        # raises), so couldn't resolve backing indexes - query is naked with
+        # and/or
         # (chained or not, doesn't matter, gotta start with all of that kind)
         _kinded_index_key = cls._magic_separator.join((cls._kind_prefix,
             (kind if isinstance(kind, basestring) else kind.kind())))
@@ -1617,27 +1832,23 @@ class RedisAdapter(DirectedGraphAdapter):
       # special case: only one unsorted set - pull content instead
       # of an intersection merge
       if _intersections and len(_intersections) == 1:
-        _data_frame.append(cls.execute(*(
+        cls.execute(*(
           cls.Operations.SET_MEMBERS,
           None,
-          _intersections.pop())))
+          _intersections.pop()), target=pipe)
 
       # more than one intersection: do an `SINTER` call instead of `SMEMBERS`
       elif _intersections and len(_intersections) > 1:
-        _data_frame.append(cls.execute(*(
+        cls.execute(*(
           cls.Operations.SET_INTERSECT,
           None,
-          _intersections)))
-
-    if _data_frame:  # there were results, start merging
-      _result_window = set()
-      for frame in _data_frame:
+          _intersections), target=pipe)
 
-        if not len(_result_window):
-          _result_window = set(frame)
-          continue  # initial frame: fill background
+    _data_frame.extend(pipe.execute())  # one round-trip for all frames
 
-        _result_window &= (set(frame) if not isinstance(frame, set) else frame)
+    if _data_frame:  # there were results, merge them (smallest first) in C
+      _data_frame.sort(key=len)
+      _result_window = set(_data_frame[0]).intersection(*_data_frame[1:])
       matching_keys = (k for k in _result_window)
     else:
       matching_keys = []
@@ -1663,35 +1874,44 @@ class RedisAdapter(DirectedGraphAdapter):
             results.append(vanilla)
       return results
 
-    result_entities, bundles = [], []  # otherwise, build entities and return
+    result_entities = []  # otherwise, build entities and return
+
+    def _bundles():
 
-    # fill pipeline
-    _queued = collections.deque()
-    for key in matching_keys:
+      """ Lazily decode matching keys into ``get_multi`` bundles. """
 
-      decoded_k, _base_kind = (
-        model.Key.from_urlsafe(key, _persisted=True), None)
-      if not decoded_k.kind == kind.kind():
-        _base_kind = cls.registry.get(kind.kind())
-      if decoded_k.kind == kind.kind() or not _base_kind:
-        _base_kind = kind
+      for key in matching_keys:
 
-      if not _base_kind:  # pragma: no cover
-        raise TypeError('Unknown model kind: "%s".' % decoded_k.kind)
+        decoded_k, _base_kind = (
+          model.Key.from_urlsafe(key, _persisted=True), None)
+        if not decoded_k.kind == kind.kind():
+          _base_kind = cls.registry.get(kind.kind())
+        if decoded_k.kind == kind.kind() or not _base_kind:
+          _base_kind = kind
 
-      # @TODO(sgammon): make vertex/edge keys unambiguous
-      decoded_k = _base_kind.__keyclass__.from_urlsafe(key)
+        if not _base_kind:  # pragma: no cover
+          raise TypeError('Unknown model kind: "%s".' % decoded_k.kind)
 
-      # queue fetch of key
-      _queued.append(decoded_k)
+        # @TODO(sgammon): make vertex/edge keys unambiguous
+        decoded_k = _base_kind.__keyclass__.from_urlsafe(key)
 
-      joined, flattened = decoded_k.flatten(True)
-      bundles.append((cls.encode_key(joined, flattened), flattened))
+        joined, flattened = decoded_k.flatten(True)
+        yield cls.encode_key(joined, flattened), flattened
 
-    # execute pipeline, zip keys and build results
-    if bundles:
-      _seen_results = 0
-      for entity in cls.get_multi(bundles):
+    # with no and/or filters every entity found matches, so the first batch
+    # only needs to be as big as the limit
+    batch_size = _QUERY_BATCH_SIZE
+    if 0 < options.limit and not (_and_filters or _or_filters):
+      batch_size = options.limit
+
+    # fetch in batches, decoding and fetching only as much as the limit needs
+    _seen_results, _fetched, bundles = 0, False, _bundles()
+    while not (0 < options.limit <= _seen_results):
+      batch = list(itertools.islice(bundles, batch_size))
+      if not batch: break
+      _fetched = True
+
+      for entity in cls.get_multi(batch):
         if not entity: continue  # skip entities that couldn't be found
 
         if _and_filters or _or_filters:
@@ -1710,6 +1930,8 @@ class RedisAdapter(DirectedGraphAdapter):
         if 0 < options.limit <= _seen_results:
           break
 
+    if _fetched:
+
       # prepare and collapse sort chain, if needed
       if sorts:
         if len(sorts) == 1:
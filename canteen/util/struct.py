@@ -402,6 +402,7 @@ class BidirectionalEnum(object):
           _plookup.add(value)
 
       _map['_keys'] = tuple(_keys)
+      _map['_members'] = dict((key, _pmap[key]) for key in _keys)
       return type.__new__(mcs, name, chain, _map)
 
     def __iter__(cls):
@@ -284,11 +284,23 @@ class AbstractModelAdapterTests(test.FrameworkTest):
 
       # try allocating 10 ID's
       next_range = [i for i in self._construct().allocate_ids(*(
-        model.Key, "Sample", 10))()]
+        model.Key, "Sample", 10))]
       assert len(next_range) == 10
       for i in next_range:
         assert isinstance(i, int)
 
+      # consecutive allocations should be contiguous and never overlap
+      first = list(self._construct().allocate_ids(*(
+        model.Key, "Allocated", 10)))
+      second = list(self._construct().allocate_ids(*(
+        model.Key, "Allocated", 10)))
+      assert first == range(first[0], first[0] + 10)
+      assert second == range(first[-1] + 1, first[-1] + 11)
+
+      # ...and the pointer should sit at the last ID handed out
+      single = self._construct().allocate_ids(model.Key, "Allocated", 1)
+      assert single == second[-1] + 1
+
 
 class IndexedModelAdapterTests(AbstractModelAdapterTests):
 
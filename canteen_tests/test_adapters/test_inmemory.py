@@ -15,16 +15,143 @@
 
 """
 
+# stdlib
+import datetime
+
 # canteen model API
+from canteen import model
 from canteen.model.adapter import inmemory
 
 # abstract test bases
 from .test_abstract import DirectedGraphAdapterTests
 
 
+class DatedModel(model.Model):
+
+  """ Test model with a `date` property. """
+
+  label = str
+  day = datetime.date
+
+
+class PooledModel(model.Model):
+
+  """ Test model for keys-only queries against pooled index sets. """
+
+  label = str
+
+
 class InMemoryAdapterTests(DirectedGraphAdapterTests):
 
   """ Tests `model.adapter.inmemory` """
 
   __abstract__ = False
   subject = inmemory.InMemoryAdapter
+
+  def test_mixed_date_range_query(self):
+
+    """ Test range queries mixing `date` and `datetime` values """
+
+    adapter = self._construct()
+    DatedModel(label='date', day=datetime.date(2020, 1, 1)).put(
+      adapter=adapter)
+    DatedModel(label='datetime', day=datetime.datetime(2020, 6, 1, 12)).put(
+      adapter=adapter)
+    DatedModel(label='old', day=datetime.date(2018, 1, 1)).put(
+      adapter=adapter)
+
+    # datetime filter value against stored dates and datetimes
+    cutoff = datetime.datetime(2019, 1, 1)
+    q = DatedModel.query().filter(DatedModel.day > cutoff)
+    labels = set(e.label for e in q.fetch(limit=10, adapter=adapter))
+    assert labels == set(('date', 'datetime'))
+
+    # date filter value against stored dates and datetimes
+    q = DatedModel.query().filter(DatedModel.day < datetime.date(2020, 3, 1))
+    labels = set(e.label for e in q.fetch(limit=10, adapter=adapter))
+    assert labels == set(('date', 'old'))
+
+  def test_query_cache(self):
+
+    """ Test serving and invalidating cached query results """
+
+    adapter = self._construct()
+    first = DatedModel(label='cached', day=datetime.date(2021, 1, 1))
+    first.put(adapter=adapter)
+
+    q = DatedModel.query().filter(DatedModel.label == 'cached')
+    assert len(q.fetch(limit=10, adapter=adapter)) == 1
+
+    # a repeat of the same query must be served from the cache
+    _run_query = self.subject.__dict__['_run_query']
+
+    def _fail(cls, *args, **kwargs):
+      """ Fail if the query is actually run. """
+
+      raise AssertionError('query should have been served from cache')
+
+    self.subject._run_query = classmethod(_fail)
+    try:
+      assert len(q.fetch(limit=10, adapter=adapter)) == 1
+    finally:
+      self.subject._run_query = _run_query
+
+    # a put must invalidate the cache
+    second = DatedModel(label='cached', day=datetime.date(2021, 1, 2))
+    second.put(adapter=adapter)
+    assert len(q.fetch(limit=10, adapter=adapter)) == 2
+
+    # and so must a delete
+    first.delete(adapter=adapter)
+    results = q.fetch(limit=10, adapter=adapter)
+    assert len(results) == 1 and results[0].key == second.key
+
+  def test_query_cache_drops_stale_results(self):
+
+    """ Test dropping query results computed across a write """
+
+    cache = inmemory._QueryCache()
+    generation = cache.generation
+    cache.invalidate()  # a write lands while the query is running
+
+    cache.set('signature', ('stale',), generation)
+    assert cache.get('signature') is None
+
+    cache.set('signature', ('fresh',), cache.generation)
+    assert cache.get('signature') == ('fresh',)
+
+  def test_lazy_keys_only_query(self):
+
+    """ Test a pending keys-only query surviving its kind emptying out """
+
+    adapter = self._construct()
+    entity = PooledModel(label='pooled')
+    entity.put(adapter=adapter)
+
+    keys = PooledModel.query().fetch(limit=10, keys_only=True, adapter=adapter)
+
+    # empty out the kind (recycling its index set) and reuse pooled sets
+    entity.delete(adapter=adapter)
+    for i in xrange(3):
+      DatedModel(label='filler-%s' % i).put(adapter=adapter)
+
+    assert list(keys) == []
+
+  def test_query_cache_graph_signature(self):
+
+    """ Test caching in-edge and out-edge queries on a node separately """
+
+    bob, steve, gift = self.test_make_directed_edge_keyname()
+    signature = lambda q: inmemory._query_signature(*(
+      q.kind, (q.filters, q.sorts), q.options))
+
+    heads, tails = steve.edges(tails=False), steve.edges(tails=True)
+    heads.fetch(adapter=self.subject(), limit=10)
+    tails.fetch(adapter=self.subject(), limit=10)
+    assert signature(heads) != signature(tails)
+
+    # chained subfilters must be part of the signature too
+    plain = DatedModel.query().filter(DatedModel.label == 'a')
+    chained = DatedModel.query().filter(
+      (DatedModel.label == 'a').OR(DatedModel.label == 'b'))
+    assert signature(plain) != signature(chained)
@@ -341,6 +341,62 @@ class ProtoRPCAdapterModuleTest(test.FrameworkTest):
     assert message_class.__name__ == SimpleContainer.kind()
     assert message_class.model.message_type.__name__ == SimpleModel.kind()
 
+  def test_message_cache_eviction(self):
+
+    """ Test evicting LRU message classes, along with their parents """
+
+
+    class CachedChild(model.Model):
+
+      """ Nested model message """
+
+      string = basestring
+
+
+    class CachedParent(model.Model):
+
+      """ Container model message """
+
+      child = CachedChild
+
+
+    class CachedOther(model.Model):
+
+      """ Unrelated model message """
+
+      string = basestring
+
+
+    class CachedAnother(model.Model):
+
+      """ Another unrelated model message """
+
+      string = basestring
+
+    limit, protorpc._cache_limit = protorpc._cache_limit, 2
+    try:
+      CachedParent.to_message_model()
+      child = CachedChild.to_message_model()  # now most-recently used
+
+      # the least-recently used parent goes, its hot child stays
+      CachedOther.to_message_model()
+      assert CachedParent not in protorpc._model_impl
+      assert CachedChild.to_message_model() is child
+
+      # evicting the child takes the parent nesting it along
+      CachedParent.to_message_model()
+      CachedParent.to_message_model()
+      CachedAnother.to_message_model()
+      assert CachedChild not in protorpc._model_impl
+      assert CachedParent not in protorpc._model_impl
+
+      # a rebuilt parent nests the rebuilt child
+      parent = CachedParent.to_message_model()
+      assert parent.child.message_type is CachedChild.to_message_model()
+
+    finally:
+      protorpc._cache_limit = limit
+
   def test_build_message_variant(self):
 
     """ Test `build_message` with a variant property """
@@ -80,6 +80,268 @@ if fakeredis:
       ss = SampleEntity.get(x, adapter=self.subject())
       assert not ss, "should have deleted entity but instead got '%s'" % ss
 
+    def test_get_multi_error(self):
+
+      """ Test Redis errors in `get_multi` surfacing instead of misses """
+
+
+      class FirstEntity(model.Model):
+
+        """ quick sample entity """
+
+        __adapter__ = rapi.RedisAdapter
+
+        string = str, {'indexed': False}
+
+
+      class SecondEntity(model.Model):
+
+        """ quick sample entity """
+
+        __adapter__ = rapi.RedisAdapter
+
+        string = str, {'indexed': False}
+
+      first = FirstEntity(key=model.Key(FirstEntity, 'first'), string='hi')
+      second = SecondEntity(key=model.Key(SecondEntity, 'second'), string='hi')
+      first.put(adapter=self.subject())
+      second.put(adapter=self.subject())
+
+      def fail(*args, **kwargs):
+        """ Simulate Redis rejecting a read. """
+
+        raise rapi.redis.ResponseError('WRONGTYPE simulated failure')
+
+      # reads of entities across kinds are always pipelined
+      rapi._mock_redis.mget = rapi._mock_redis.hmget = fail
+      try:
+        with self.assertRaises(rapi.redis.ResponseError):
+          list(FirstEntity.get_multi([first.key, second.key],
+                                     adapter=self.subject()))
+      finally:
+        del rapi._mock_redis.mget, rapi._mock_redis.hmget
+
+    def test_compression(self):
+
+      """ Test reading back compressed and uncompressed values """
+
+
+      class CompressedEntity(model.Model):
+
+        """ quick sample entity """
+
+        __adapter__ = rapi.RedisAdapter
+
+        string = str, {'indexed': False}
+
+      rapi.RedisAdapter.EngineConfig.compression = True
+      try:
+        # one payload worth compressing, and one too small to bother with
+        for name, value in (('large', 'compressible ' * 32), ('small', 'hi')):
+          s = CompressedEntity(key=model.Key(CompressedEntity, name),
+                               string=value)
+          s.put(adapter=self.subject())
+
+          ss = CompressedEntity.get(s.key, adapter=self.subject())
+          assert ss.string == value
+
+      finally:
+        rapi.RedisAdapter.EngineConfig.compression = False
+
+    def test_float_round_trip(self):
+
+      """ Test floats surviving a round-trip through Redis at full precision """
+
+
+      class PreciseEntity(model.Model):
+
+        """ quick sample entity """
+
+        __adapter__ = rapi.RedisAdapter
+
+        floating = float, {'indexed': False}
+
+      value = 0.1234567890123456789
+      s = PreciseEntity(key=model.Key(PreciseEntity, 'precise'), floating=value)
+      s.put(adapter=self.subject())
+
+      ss = PreciseEntity.get(s.key, adapter=self.subject())
+      assert ss.floating == value
+
+    def test_dedupe_writes(self):
+
+      """ Test skipping unchanged re-writes with `dedupe_writes` """
+
+
+      class DedupedEntity(model.Model):
+
+        """ quick sample entity """
+
+        __adapter__ = rapi.RedisAdapter
+
+        string = str, {'indexed': False}
+
+      writes, original = [], rapi.RedisAdapter.__dict__['execute']
+
+      def execute(cls, operation, kind, *args, **kwargs):
+        """ Count entity writes on their way to Redis. """
+
+        if operation in (cls.Operations.SET, cls.Operations.HASH_SET):
+          writes.append(operation)
+        return original.__func__(cls, operation, kind, *args, **kwargs)
+
+      rapi._write_digests.clear()
+      rapi.RedisAdapter.EngineConfig.dedupe_writes = True
+      rapi.RedisAdapter.execute = classmethod(execute)
+
+      try:
+        s = DedupedEntity(key=model.Key(DedupedEntity, 'deduped'),
+                          string='hi')
+        s.put(adapter=self.subject())
+        assert len(writes) == 1
+        assert len(rapi._write_digests) == 1
+
+        # an identical re-write should be skipped
+        s.put(adapter=self.subject())
+        assert len(writes) == 1
+
+        # a changed entity should be written
+        s.string = 'hello'
+        s.put(adapter=self.subject())
+        assert len(writes) == 2
+
+        ss = DedupedEntity.get(s.key, adapter=self.subject())
+        assert ss.string == 'hello'
+
+      finally:
+        rapi.RedisAdapter.execute = original
+        rapi.RedisAdapter.EngineConfig.dedupe_writes = False
+        rapi._write_digests.clear()
+
+    def test_dedupe_writes_external_delete(self):
+
+      """ Test `dedupe_writes` re-writing entities deleted behind its back """
+
+
+      class ExternalEntity(model.Model):
+
+        """ quick sample entity """
+
+        __adapter__ = rapi.RedisAdapter
+
+        string = str, {'indexed': False}
+
+      rapi._write_digests.clear()
+      rapi.RedisAdapter.EngineConfig.dedupe_writes = True
+
+      try:
+        existing = set(rapi._mock_redis.keys())
+        s = ExternalEntity(key=model.Key(ExternalEntity, 'external'),
+                           string='hi')
+        s.put(adapter=self.subject())
+
+        # delete everything the put created, without going through the adapter
+        rapi._mock_redis.delete(*(set(rapi._mock_redis.keys()) - existing))
+        assert not ExternalEntity.get(s.key, adapter=self.subject())
+
+        s.put(adapter=self.subject())
+        ss = ExternalEntity.get(s.key, adapter=self.subject())
+        assert ss and ss.string == 'hi'
+
+      finally:
+        rapi.RedisAdapter.EngineConfig.dedupe_writes = False
+        rapi._write_digests.clear()
+
+    def test_dedupe_writes_atomic(self):
+
+      """ Test index writes joining the caller's pipeline on a skipped write """
+
+
+      class AtomicEntity(model.Model):
+
+        """ quick sample entity """
+
+        __adapter__ = rapi.RedisAdapter
+
+        string = str, {'indexed': True}
+
+      rapi._write_digests.clear()
+      rapi.RedisAdapter.EngineConfig.dedupe_writes = True
+
+      try:
+        s = AtomicEntity(key=model.Key(AtomicEntity, 'atomic'), string='hi')
+        s.put(adapter=self.subject())
+
+        class SizedPipeline(fakeredis.FakePipeline):
+
+          """ Pipeline that is falsy while empty, like redis-py's. """
+
+          def __len__(self):
+            """ Count queued commands. """
+
+            return len(self.commands)
+
+        # the entity write is skipped, leaving the pipeline empty (and falsy)
+        queued, pipeline = [], SizedPipeline(*(
+          self.subject().channel('AtomicEntity'),), transaction=True)
+        execute = pipeline.execute
+
+        def spy(*args, **kwargs):
+          """ Record how many commands were queued before executing. """
+
+          queued.append(len(pipeline.commands))
+          return execute(*args, **kwargs)
+
+        pipeline.execute = spy
+        s.put(adapter=self.subject(), pipeline=pipeline, atomic=True)
+        assert queued and queued[0] > 0
+
+        ss = AtomicEntity.get(s.key, adapter=self.subject())
+        assert ss.string == 'hi'
+
+      finally:
+        rapi.RedisAdapter.EngineConfig.dedupe_writes = False
+        rapi._write_digests.clear()
+
+    def test_dedupe_writes_failure(self):
+
+      """ Test `dedupe_writes` forgetting writes that failed """
+
+
+      class FailedEntity(model.Model):
+
+        """ quick sample entity """
+
+        __adapter__ = rapi.RedisAdapter
+
+        string = str, {'indexed': False}
+
+      def execute(*args, **kwargs):
+        """ Simulate a pipeline failing to execute. """
+
+        raise RuntimeError('pipeline failed')
+
+      rapi._write_digests.clear()
+      rapi.RedisAdapter.EngineConfig.dedupe_writes = True
+
+      try:
+        s = FailedEntity(key=model.Key(FailedEntity, 'failed'), string='hi')
+
+        pipeline = self.subject().channel('FailedEntity').pipeline()
+        pipeline.execute = execute
+        with self.assertRaises(RuntimeError):
+          s.put(adapter=self.subject(), pipeline=pipeline)
+        assert not rapi._write_digests
+
+        # the retried write must actually reach Redis
+        s.put(adapter=self.subject())
+        ss = FailedEntity.get(s.key, adapter=self.subject())
+        assert ss and ss.string == 'hi'
+
+      finally:
+        rapi.RedisAdapter.EngineConfig.dedupe_writes = False
+        rapi._write_digests.clear()
+
 
   class RedisAdapterTopLevelBlobTests(test_abstract.DirectedGraphAdapterTests,
                                       RedisSetupTeardown):